@@ -29,7 +29,8 @@ class ButtonCameraGUI:
         self.disp = display.Display()
         
         # 功能模块
-        self.detector = PersonDetector(camera_width=512, camera_height=320)
+        # 在256x160的缩小图上检测，显示和识别仍使用原图
+        self.detector = PersonDetector(camera_width=512, camera_height=320, detect_scale=2)
         self.recognizer = PersonRecognizer()
         
         # 按键状态
@@ -55,9 +56,21 @@ class ButtonCameraGUI:
         # 界面状态
         self.frame_count = 0
         self.fps_counter = 0
-        self.fps_start_time = time.time()
+        self.fps_start_ns = time.monotonic_ns()
         self.current_fps = 0
         
+        # 每帧用到的格式化方法预先绑定，避免重复解析格式串
+        self._fps_fmt = "FPS: {:.1f}".format
+        self._status_fmt = "人物: {}/{}".format
+        self._record_fmt = "记录中: {} ({}/{})".format
+        self._key_texts = {
+            'record': ("记录键: 释放", "记录键: 按下"),
+            'clear': ("清除键: 释放", "清除键: 按下")
+        }
+        
+        # 底部操作说明内容固定，预先绘制成贴图，每帧只需一次贴图
+        self._help_panel = self._build_help_panel()
+        
         print("=== 按键控制摄像头界面 ===")
         print("硬件连接:")
         print("  - 记录按键: 连接到GPIO引脚")
@@ -169,6 +182,20 @@ class ButtonCameraGUI:
         cycle_time = time.time() % 30
         return 25 <= cycle_time <= 26  # 模拟按键按下1秒
     
+    def _build_help_panel(self):
+        """
+        绘制底部操作说明贴图
+        
+        Returns:
+            image.Image: 透明背景的操作说明贴图
+        """
+        panel = image.Image(200, 40, image.Format.FMT_RGBA8888)
+        panel.draw_rect(0, 0, 200, 40, color=image.Color.from_rgba(0, 0, 0, 0), thickness=-1)
+        panel.draw_string(0, 0, "操作说明:", color=image.Color.from_rgb(255, 255, 255))
+        panel.draw_string(0, 15, "记录键短按: 记录人脸", color=image.Color.from_rgb(255, 255, 0))
+        panel.draw_string(0, 30, "清除键: 删除所有记录", color=image.Color.from_rgb(255, 255, 0))
+        return panel
+    
     def _draw_ui(self, img):
         """
         绘制用户界面
@@ -183,34 +210,32 @@ class ButtonCameraGUI:
             
             # 系统状态
             status = self.recognizer.get_status_info()
-            status_text = f"人物: {status['registered_count']}/{status['max_persons']}"
+            status_text = self._status_fmt(status['registered_count'], status['max_persons'])
             img.draw_string(10, 35, status_text, color=image.Color.from_rgb(0, 255, 255))
             
             # 记录状态
             if self.recording['active']:
-                record_text = f"记录中: {self.recording['name']} ({self.recording['samples']}/{self.recording['max_samples']})"
+                record_text = self._record_fmt(self.recording['name'], self.recording['samples'],
+                                               self.recording['max_samples'])
                 img.draw_string(10, 55, record_text, color=image.Color.from_rgb(255, 255, 0))
             else:
                 img.draw_string(10, 55, "待机模式", color=image.Color.from_rgb(0, 255, 0))
             
             # 按键状态指示
-            record_status = "按下" if self.button_states['record'] else "释放"
-            clear_status = "按下" if self.button_states['clear'] else "释放"
+            record_text = self._key_texts['record'][bool(self.button_states['record'])]
+            clear_text = self._key_texts['clear'][bool(self.button_states['clear'])]
             
-            img.draw_string(10, 75, f"记录键: {record_status}", 
+            img.draw_string(10, 75, record_text, 
                           color=image.Color.from_rgb(255, 128, 0))
-            img.draw_string(10, 95, f"清除键: {clear_status}", 
+            img.draw_string(10, 95, clear_text, 
                           color=image.Color.from_rgb(255, 128, 0))
             
             # FPS显示
-            img.draw_string(10, 115, f"FPS: {self.current_fps:.1f}", 
+            img.draw_string(10, 115, self._fps_fmt(self.current_fps), 
                           color=image.Color.from_rgb(128, 128, 128))
             
             # 操作说明（底部）
-            help_y = 280
-            img.draw_string(10, help_y, "操作说明:", color=image.Color.from_rgb(255, 255, 255))
-            img.draw_string(10, help_y + 15, "记录键短按: 记录人脸", color=image.Color.from_rgb(255, 255, 0))
-            img.draw_string(10, help_y + 30, "清除键: 删除所有记录", color=image.Color.from_rgb(255, 255, 0))
+            img.draw_image(10, 280, self._help_panel)
             
         except Exception as e:
             print(f"UI绘制错误: {e}")
@@ -228,7 +253,12 @@ class ButtonCameraGUI:
         detections = self.detector.detect_persons(img)
         
         if detections:
-            for detection in detections:
+            # 一次批量识别本帧所有人脸，循环中按检测结果取用
+            reco_results = [None] * len(detections)
+            if not self.recording['active']:
+                reco_results = self.recognizer.recognize_detections(img, detections)
+            
+            for detection, reco_result in zip(detections, reco_results):
                 bbox = detection['bbox']
                 face_bbox = detection.get('face_bbox')
                 x, y, w, h = bbox
@@ -253,7 +283,7 @@ class ButtonCameraGUI:
                 
                 # 识别和标注
                 if face_bbox and not self.recording['active']:
-                    person_id, confidence, person_name = self.recognizer.recognize_person(img, face_bbox)
+                    person_id, confidence, person_name = reco_result
                     
                     if person_id:
                         # 已知人物
@@ -426,12 +456,13 @@ class ButtonCameraGUI:
         更新FPS计算
         """
         self.fps_counter += 1
-        current_time = time.time()
+        now = time.monotonic_ns()
+        elapsed = now - self.fps_start_ns
         
-        if current_time - self.fps_start_time >= 1.0:
-            self.current_fps = self.fps_counter / (current_time - self.fps_start_time)
+        if elapsed >= 1_000_000_000:
+            self.current_fps = self.fps_counter * 1e9 / elapsed
             self.fps_counter = 0
-            self.fps_start_time = current_time
+            self.fps_start_ns = now
     
     def run(self):
         """
@@ -36,7 +36,8 @@ class CameraGUI:
         self.disp = display.Display()
         
         # 初始化检测器和识别器
-        self.detector = PersonDetector(camera_width=width, camera_height=height)
+        # 在缩小一半的图上检测，显示和识别仍使用原图
+        self.detector = PersonDetector(camera_width=width, camera_height=height, detect_scale=2)
         self.recognizer = PersonRecognizer()
         
         # GUI状态
@@ -166,6 +167,11 @@ class CameraGUI:
         if not detections:
             return img
         
+        # 一次批量识别本帧所有人脸，循环中按检测结果取用
+        reco_results = [None] * len(detections)
+        if self.current_mode == "live":
+            reco_results = self.recognizer.recognize_detections(img, detections)
+        
         for i, detection in enumerate(detections):
             bbox = detection['bbox']
             face_bbox = detection.get('face_bbox')
@@ -178,7 +184,7 @@ class CameraGUI:
                 
                 # 尝试识别人物
                 if face_bbox:
-                    person_id, confidence, person_name = self.recognizer.recognize_person(img, face_bbox)
+                    person_id, confidence, person_name = reco_results[i]
                     
                     if person_id:
                         # 已知人物：红色框
@@ -6,6 +6,7 @@
 """
 
 import time
+import random
 import sys
 import os
 from maix import camera, display, app, image
@@ -28,6 +29,22 @@ except ImportError:
     HAS_FACE_DETECTOR = False
     print("✗ MaixPy face detection module unavailable, using simulation mode")
 
+# 界面常用颜色，模块加载时创建一次，避免每帧重复构造
+_COLORS = {
+    'white': image.Color.from_rgb(255, 255, 255),
+    'red': image.Color.from_rgb(255, 0, 0),
+    'green': image.Color.from_rgb(0, 255, 0),
+    'cyan': image.Color.from_rgb(0, 255, 255),
+    'yellow': image.Color.from_rgb(255, 255, 0),
+    'orange': image.Color.from_rgb(255, 165, 0),
+    'gray': image.Color.from_rgb(128, 128, 128),
+    'hint': image.Color.from_rgb(200, 200, 200),
+    'record_idle': image.Color.from_rgb(0, 150, 0),
+    'cancel_idle': image.Color.from_rgb(200, 150, 0),
+    'clear_idle': image.Color.from_rgb(150, 0, 0),
+    'disabled': image.Color.from_rgb(80, 80, 80),
+}
+
 class KeyboardControlGUI:
     """
     键盘控制的虚拟按键界面
@@ -52,6 +69,13 @@ class KeyboardControlGUI:
         else:
             print("✗ Face detection module unavailable, using simulation mode")
         
+        # 不随帧变化的提示文字，初始化时确定
+        self._detector_msg = "Detection: " + ("Real Detection" if self.face_detector else "Simulated")
+        if HAS_KEYBOARD:
+            self._hint_msg = "Press R=Record C=Clear ESC=Exit"
+        else:
+            self._hint_msg = "Test mode - Auto demo running"
+        
         # 简化的数据存储
         self.registered_persons = {}
         self.max_persons = 3
@@ -62,6 +86,9 @@ class KeyboardControlGUI:
             'clear': {'x': 420, 'y': 295, 'w': 80, 'h': 35, 'active': False, 'enabled': True}
         }
         
+        # 按键贴图缓存：(尺寸, 颜色, 文字, 提示) -> 贴图
+        self._button_tiles = {}
+        
         # 记录状态
         self.recording = False
         self.recording_name = ""
@@ -74,6 +101,8 @@ class KeyboardControlGUI:
         
         # 测试模式（当没有键盘库时）
         self.test_mode_start = time.time()
+        self.test_record_done = False
+        self.test_clear_done = False
         
         print("=== Keyboard Control GUI ===")
         if HAS_KEYBOARD:
@@ -108,7 +137,6 @@ class KeyboardControlGUI:
         
         if not detections:
             # 模拟检测（用于演示）
-            import random
             if random.random() > 0.4:  # 60%概率
                 x = random.randint(50, 300)
                 y = random.randint(50, 200)
@@ -136,9 +164,9 @@ class KeyboardControlGUI:
             
             # 选择颜色
             if self.recording:
-                color = image.Color.from_rgb(255, 255, 0)  # 黄色 - 记录中
+                color = _COLORS['yellow']  # 黄色 - 记录中
             else:
-                color = image.Color.from_rgb(0, 255, 0)    # 绿色 - 正常
+                color = _COLORS['green']    # 绿色 - 正常
             
             try:
                 img.draw_rect(x, y, w, h, color=color, thickness=2)
@@ -146,17 +174,16 @@ class KeyboardControlGUI:
                 # 显示识别结果
                 if not self.recording and self.registered_persons:
                     # 简单的识别逻辑
-                    import random
                     if random.random() > 0.5:
                         person_names = list(self.registered_persons.values())
                         if person_names:
                             name = random.choice(person_names)
                             label = f"{name} (0.87)"
                             img.draw_string(x, y - 20, label, 
-                                          color=image.Color.from_rgb(255, 0, 0))
+                                          color=_COLORS['red'])
                     else:
                         img.draw_string(x, y - 20, "Unknown (0.65)", 
-                                      color=image.Color.from_rgb(255, 255, 255))
+                                      color=_COLORS['white'])
             except:
                 pass
     
@@ -172,18 +199,14 @@ class KeyboardControlGUI:
         x, y, w, h = record_btn['x'], record_btn['y'], record_btn['w'], record_btn['h']
         
         if self.recording:
-            color = image.Color.from_rgb(255, 255, 0) if record_btn['active'] else image.Color.from_rgb(200, 150, 0)
+            color = _COLORS['yellow'] if record_btn['active'] else _COLORS['cancel_idle']
             text = "Cancel"
         else:
-            color = image.Color.from_rgb(0, 255, 0) if record_btn['active'] else image.Color.from_rgb(0, 150, 0)
+            color = _COLORS['green'] if record_btn['active'] else _COLORS['record_idle']
             text = "Record"
         
         try:
-            img.draw_rect(x, y, w, h, color=color, thickness=-1)
-            img.draw_rect(x, y, w, h, color=image.Color.from_rgb(255, 255, 255), thickness=2)
-            img.draw_string(x + 12, y + 10, text, color=image.Color.from_rgb(255, 255, 255))
-            # 显示按键提示
-            img.draw_string(x + 15, y + 25, "(R)", color=image.Color.from_rgb(200, 200, 200))
+            img.draw_image(x, y, self._button_tile(w, h, color, text, 12, "(R)"))
         except:
             pass
         
@@ -193,19 +216,41 @@ class KeyboardControlGUI:
         
         has_records = len(self.registered_persons) > 0
         if has_records:
-            color = image.Color.from_rgb(255, 0, 0) if clear_btn['active'] else image.Color.from_rgb(150, 0, 0)
+            color = _COLORS['red'] if clear_btn['active'] else _COLORS['clear_idle']
         else:
-            color = image.Color.from_rgb(80, 80, 80)
+            color = _COLORS['disabled']
         
         try:
-            img.draw_rect(x, y, w, h, color=color, thickness=-1)
-            img.draw_rect(x, y, w, h, color=image.Color.from_rgb(255, 255, 255), thickness=2)
-            img.draw_string(x + 18, y + 10, "Clear", color=image.Color.from_rgb(255, 255, 255))
-            # 显示按键提示
-            img.draw_string(x + 15, y + 25, "(C)", color=image.Color.from_rgb(200, 200, 200))
+            img.draw_image(x, y, self._button_tile(w, h, color, "Clear", 18, "(C)"))
         except:
             pass
     
+    def _button_tile(self, w, h, color, text, text_x, hint):
+        """
+        获取按键贴图，背景、边框和文字只在第一次用到时绘制一次
+        
+        Args:
+            w, h: 按键尺寸
+            color: 背景颜色
+            text: 按键文字
+            text_x: 文字相对按键左边的偏移
+            hint: 按键提示
+            
+        Returns:
+            image.Image: 按键贴图
+        """
+        key = (w, h, id(color), text, hint)
+        tile = self._button_tiles.get(key)
+        if tile is None:
+            tile = image.Image(w, h)
+            tile.draw_rect(0, 0, w, h, color=color, thickness=-1)
+            tile.draw_rect(0, 0, w, h, color=_COLORS['white'], thickness=2)
+            tile.draw_string(text_x, 10, text, color=_COLORS['white'])
+            # 显示按键提示
+            tile.draw_string(15, 25, hint, color=_COLORS['hint'])
+            self._button_tiles[key] = tile
+        return tile
+    
     def _draw_info(self, img):
         """
         绘制信息
@@ -216,46 +261,39 @@ class KeyboardControlGUI:
         try:
             # 标题
             img.draw_string(10, 10, "Keyboard Control Face Recognition", 
-                          color=image.Color.from_rgb(255, 255, 255))
+                          color=_COLORS['white'])
             
             # 状态
             status_text = f"Registered: {len(self.registered_persons)}/{self.max_persons}"
             img.draw_string(10, 35, status_text, 
-                          color=image.Color.from_rgb(0, 255, 255))
+                          color=_COLORS['cyan'])
             
             # 模式
             if self.recording:
                 mode_text = f"Recording: {self.recording_name} ({self.recording_samples}/3)"
-                color = image.Color.from_rgb(255, 255, 0)
+                color = _COLORS['yellow']
             else:
                 mode_text = "Live Detection Mode"
-                color = image.Color.from_rgb(0, 255, 0)
+                color = _COLORS['green']
             
             img.draw_string(10, 55, mode_text, color=color)
             
             # 检测状态
-            detector_text = "Real Detection" if self.face_detector else "Simulated"
-            img.draw_string(10, 75, f"Detection: {detector_text}", 
-                          color=image.Color.from_rgb(128, 128, 128))
+            img.draw_string(10, 75, self._detector_msg, color=_COLORS['gray'])
             
             # 控制状态
             if HAS_KEYBOARD:
                 control_text = "Keyboard Control Ready"
-                color = image.Color.from_rgb(0, 255, 0)
+                color = _COLORS['green']
             else:
                 elapsed = time.time() - self.test_mode_start
                 control_text = f"Test Mode: {elapsed:.1f}s"
-                color = image.Color.from_rgb(255, 165, 0)
+                color = _COLORS['orange']
             
             img.draw_string(10, 95, control_text, color=color)
             
             # 提示
-            if HAS_KEYBOARD:
-                img.draw_string(10, 280, "Press R=Record C=Clear ESC=Exit", 
-                              color=image.Color.from_rgb(255, 255, 0))
-            else:
-                img.draw_string(10, 280, "Test mode - Auto demo running", 
-                              color=image.Color.from_rgb(255, 255, 0))
+            img.draw_string(10, 280, self._hint_msg, color=_COLORS['yellow'])
         except:
             pass
     
@@ -297,14 +335,14 @@ class KeyboardControlGUI:
             cycle_time = elapsed % 15  # 15秒循环
             
             if 3 <= cycle_time <= 3.5:  # 第3秒触发记录
-                if not hasattr(self, 'test_record_done'):
+                if not self.test_record_done:
                     self.test_record_done = True
                     self.last_key_time = current_time
                     self._flash_button('record')
                     print("Test mode: Auto record")
                     return 'record'
             elif 10 <= cycle_time <= 10.5:  # 第10秒触发清除
-                if not hasattr(self, 'test_clear_done'):
+                if not self.test_clear_done:
                     self.test_clear_done = True
                     self.last_key_time = current_time
                     self._flash_button('clear')
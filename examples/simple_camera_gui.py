@@ -29,7 +29,8 @@ class SimpleCameraGUI:
         self.disp = display.Display()
         
         # 检测和识别
-        self.detector = PersonDetector(camera_width=512, camera_height=320)
+        # 在256x160的缩小图上检测，显示和识别仍使用原图
+        self.detector = PersonDetector(camera_width=512, camera_height=320, detect_scale=2)
         self.recognizer = PersonRecognizer()
         
         # 状态控制
@@ -121,7 +122,12 @@ class SimpleCameraGUI:
         detections = self.detector.detect_persons(img)
         
         if detections:
-            for detection in detections:
+            # 一次批量识别本帧所有人脸，循环中按检测结果取用
+            reco_results = [None] * len(detections)
+            if not self.recording_mode:
+                reco_results = self.recognizer.recognize_detections(img, detections)
+            
+            for detection, reco_result in zip(detections, reco_results):
                 bbox = detection['bbox']
                 face_bbox = detection.get('face_bbox')
                 x, y, w, h = bbox
@@ -148,7 +154,7 @@ class SimpleCameraGUI:
                     
                     # 在非记录模式下尝试识别
                     if not self.recording_mode:
-                        person_id, confidence, person_name = self.recognizer.recognize_person(img, face_bbox)
+                        person_id, confidence, person_name = reco_result
                         
                         if person_id:
                             # 已知人物 - 红色标注
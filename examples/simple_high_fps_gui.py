@@ -8,6 +8,7 @@
 """
 
 import time
+import random
 from maix import camera, display, app, image, touchscreen
 
 # 简化的人脸识别功能
@@ -171,7 +172,7 @@ class HighFpsGUI:
         
         # FPS计算
         self.fps_counter = 0
-        self.fps_start_time = time.time()
+        self.fps_start_ns = time.monotonic_ns()
         self.current_fps = 0
         
         # 触摸状态
@@ -230,7 +231,6 @@ class HighFpsGUI:
         
         # 如果没有检测到，添加模拟人脸（用于演示）
         if not faces and not self.face_detector:
-            import random
             if random.random() > 0.3:  # 70%概率
                 x = random.randint(20, self.width - 80)
                 y = random.randint(20, self.height - 80)
@@ -310,12 +310,13 @@ class HighFpsGUI:
     def update_fps(self):
         """更新FPS"""
         self.fps_counter += 1
-        current_time = time.time()
+        now = time.monotonic_ns()
         
-        if current_time - self.fps_start_time >= 1.0:
+        # 整数纳秒计时，满1秒才换算一次
+        if now - self.fps_start_ns >= 1_000_000_000:
             self.current_fps = self.fps_counter
             self.fps_counter = 0
-            self.fps_start_time = current_time
+            self.fps_start_ns = now
     
     def draw_faces(self, img, faces):
         """绘制人脸框"""
@@ -6,6 +6,7 @@
 """
 
 import time
+import random
 from maix import camera, display, app, image
 
 # 检查人脸检测功能
@@ -90,7 +91,6 @@ class SimpleGUI:
         
         if not detections:
             # 模拟检测（用于演示）
-            import random
             if random.random() > 0.4:  # 60%概率
                 x = random.randint(50, 300)
                 y = random.randint(50, 200)
@@ -128,7 +128,6 @@ class SimpleGUI:
                 # 显示识别结果
                 if not self.recording and self.registered_persons:
                     # 简单的识别逻辑
-                    import random
                     if random.random() > 0.5:
                         person_names = list(self.registered_persons.values())
                         if person_names:
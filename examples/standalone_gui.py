@@ -8,9 +8,23 @@ All features integrated in one file, no external dependencies
 import sys
 import os
 import time
+import random
 import json
 from maix import camera, display, app, image, touchscreen
 
+# NumPy 可选：用于按键命中检测的批量比较，不可用时逐个按键检查
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# numba 可选：可用时把按键命中检测编译成机器码（按键数组依赖 NumPy）
+try:
+    from numba import njit
+    _HAS_NUMBA = np is not None
+except ImportError:
+    _HAS_NUMBA = False
+
 # Check if face detection functionality is available
 try:
     from maix import nn
@@ -20,6 +34,102 @@ except ImportError:
     HAS_FACE_DETECTOR = False
     print("✗ MaixPy face detection module unavailable, using simulation mode")
 
+# (r, g, b) -> image.Color 缓存，相同颜色共用同一个颜色对象
+_COLOR_CACHE = {}
+
+def _probe_color_tuple():
+    """
+    检查绘制接口能否直接接受 (r, g, b) 元组作为颜色
+    只有设置了 MAIXPY_COLOR_TUPLE=1 时才尝试，旧固件保持使用 Color 对象
+    
+    Returns:
+        bool: 是否可以直接使用元组
+    """
+    if os.environ.get('MAIXPY_COLOR_TUPLE') != '1':
+        return False
+    try:
+        image.Image(8, 8).draw_rect(0, 0, 2, 2, color=(255, 255, 255), thickness=1)
+        return True
+    except Exception:
+        return False
+
+_COLOR_AS_TUPLE = _probe_color_tuple()
+
+def _color(rgb):
+    """
+    获取（缓存的）颜色对象
+    
+    Args:
+        rgb: (r, g, b) 颜色元组
+        
+    Returns:
+        image.Color: 颜色对象（固件支持时直接返回元组）
+    """
+    if _COLOR_AS_TUPLE:
+        return rgb
+    color = _COLOR_CACHE.get(rgb)
+    if color is None:
+        color = image.Color.from_rgb(*rgb)
+        _COLOR_CACHE[rgb] = color
+    return color
+
+# 界面颜色表，模块加载时通过 _color 解析一次，绘制代码直接取用，避免每帧重复构造
+_COLORS = {
+    'white': _color((255, 255, 255)),
+    'red': _color((255, 0, 0)),
+    'green': _color((0, 255, 0)),
+    'cyan': _color((0, 255, 255)),
+    'yellow': _color((255, 255, 0)),
+    'orange': _color((255, 165, 0)),
+    'gray': _color((128, 128, 128)),
+    'transparent': image.Color.from_rgba(0, 0, 0, 0),
+    # 按键背景：普通 / 点击 / 不可用
+    'record': _color((0, 150, 0)),
+    'record_active': _color((0, 255, 0)),
+    'cancel': _color((200, 150, 0)),
+    'cancel_active': _color((255, 255, 0)),
+    'clear': _color((150, 0, 0)),
+    'clear_active': _color((255, 0, 0)),
+    'disabled': _color((80, 80, 80)),
+}
+
+# 错误类别 -> 上次打印时间（纳秒），帧循环中同类错误每秒最多打印一次
+_ERR_LOG_LAST = {}
+
+def _log_error(key, message):
+    """
+    打印帧循环中的错误，同一类别每秒最多一次，避免持续出错时刷屏拖慢帧率
+    
+    Args:
+        key: 错误类别
+        message: 错误信息
+    """
+    now = time.monotonic_ns()
+    if now - _ERR_LOG_LAST.get(key, 0) >= 1_000_000_000:
+        _ERR_LOG_LAST[key] = now
+        print(message)
+
+def _hit_kernel(rects, enabled, x, y):
+    """
+    查找第一个包含触摸点的可用按键
+    
+    Args:
+        rects: (N, 4) 的 (x, y, x2, y2) 按键矩形
+        enabled: (N,) 按键是否可用
+        x, y: 触摸坐标
+        
+    Returns:
+        int: 按键下标，没有命中时返回-1
+    """
+    for i in range(rects.shape[0]):
+        if (enabled[i] and rects[i, 0] <= x <= rects[i, 2]
+                and rects[i, 1] <= y <= rects[i, 3]):
+            return i
+    return -1
+
+if _HAS_NUMBA:
+    _hit_kernel = njit(cache=True)(_hit_kernel)
+
 class SimplePersonRecognizer:
     """
     Simplified person recognizer
@@ -87,8 +197,8 @@ class SimplePersonRecognizer:
             if info['name'] == person_name:
                 return False, None, f"人物 '{person_name}' 已存在"
         
-        # 生成新的person_id
-        person_id = f"person_{len(self.registered_persons) + 1:02d}"
+        # 生成新的person_id（按人数编号会在删除人物后与现有ID重复）
+        person_id = self._next_person_id()
         
         # 保存人物信息
         self.registered_persons[person_id] = {
@@ -101,6 +211,18 @@ class SimplePersonRecognizer:
         print(f"Successfully registered person: {person_name} (ID: {person_id})")
         return True, person_id, f"Successfully registered person: {person_name}"
     
+    def _next_person_id(self):
+        """
+        生成未被占用的最小人物ID，删除人物后空出的编号会被复用
+        
+        Returns:
+            str: 人物ID
+        """
+        slot = 1
+        while f"person_{slot:02d}" in self.registered_persons:
+            slot += 1
+        return f"person_{slot:02d}"
+    
     def add_person_sample(self, person_id, img, bbox=None):
         """
         添加人物样本
@@ -135,7 +257,6 @@ class SimplePersonRecognizer:
             return None, 0.0, "Unknown"
         
         # 简化的识别逻辑：随机返回一个已注册的人物
-        import random
         if random.random() > 0.5:  # 50%概率识别成功
             person_id = random.choice(list(self.registered_persons.keys()))
             person_name = self.registered_persons[person_id]['name']
@@ -246,11 +367,10 @@ class SimplePersonDetector:
                     detections.append(detection)
             
             except Exception as e:
-                print(f"Face detection error: {e}")
+                _log_error('detect', f"Face detection error: {e}")
         
         else:
             # 模拟检测结果
-            import random
             if random.random() > 0.4:  # 60%概率检测到人脸
                 center_x = self.camera_width // 2
                 center_y = self.camera_height // 2
@@ -283,6 +403,33 @@ class SimplePersonDetector:
                 detections.append(detection)
         
         return detections
+    
+    def calculate_iou(self, bbox1, bbox2):
+        """
+        计算两个边界框的IoU（交并比）
+        
+        Args:
+            bbox1, bbox2: (x, y, w, h) 格式的边界框
+            
+        Returns:
+            float: IoU值
+        """
+        x1, y1, w1, h1 = bbox1
+        x2, y2, w2, h2 = bbox2
+        
+        # 计算交集
+        x_left = max(x1, x2)
+        y_top = max(y1, y2)
+        x_right = min(x1 + w1, x2 + w2)
+        y_bottom = min(y1 + h1, y2 + h2)
+        
+        if x_right <= x_left or y_bottom <= y_top:
+            return 0.0
+        
+        intersection = (x_right - x_left) * (y_bottom - y_top)
+        union = w1 * h1 + w2 * h2 - intersection
+        
+        return intersection / union if union > 0 else 0.0
 
 class StandaloneGUI:
     """
@@ -333,8 +480,11 @@ class StandaloneGUI:
                 'h': button_height,
                 'text': '记录',
                 'active': False,
-                'last_click': 0,
-                'enabled': True
+                'last_click_ns': 0,
+                'enabled': True,
+                # (普通, 记录中) 两种样式，每种为 ((普通色, 点击色), 文字)
+                'styles': (((_COLORS['record'], _COLORS['record_active']), 'Record'),
+                           ((_COLORS['cancel'], _COLORS['cancel_active']), 'Cancel'))
             },
             'clear': {
                 'x': width - button_width - button_margin,
@@ -343,11 +493,19 @@ class StandaloneGUI:
                 'h': button_height,
                 'text': '清除',
                 'active': False,
-                'last_click': 0,
-                'enabled': True
+                'last_click_ns': 0,
+                'enabled': True,
+                'styles': (((_COLORS['clear'], _COLORS['clear_active']), 'Clear'),) * 2
             }
         }
         
+        # 按键几何信息按列存放，触摸命中检测一次比较所有按键
+        self._rebuild_button_arrays()
+        
+        # 预先触发一次 JIT 编译，避免第一次触摸时卡顿
+        if _HAS_NUMBA:
+            _hit_kernel(self._btn_rects, np.ones(len(self._btn_ids), dtype=np.bool_), -1, -1)
+        
         # 记录状态
         self.recording = {
             'active': False,
@@ -355,13 +513,21 @@ class StandaloneGUI:
             'samples': 0,
             'max_samples': 3,
             'person_id': None,
-            'last_sample_time': 0,
-            'sample_interval': 1.5
+            'last_sample_ns': 0,
+            'sample_interval_ns': 1_500_000_000  # 采样间隔 1.5 秒，整数纳秒
         }
         
         # 界面状态
         self.frame_count = 0
         self.click_cooldown = 0.5
+        # 按键计时使用整数纳秒单调时钟
+        self._click_cooldown_ns = int(self.click_cooldown * 1e9)
+        self._active_release_ns = 200_000_000  # 点击高亮持续时间
+        
+        # 识别间隔：每 recog_interval 帧识别一次，中间帧沿用上次结果
+        self.recog_interval = 3
+        self._last_results = []  # 上次识别的 (人脸框, (person_id, confidence, person_name))
+        self.track_iou_threshold = 0.4  # 中间帧按人脸框IoU匹配上次结果的最小IoU
         self.debug_mode = True  # 显示调试信息
         
         # 触摸状态
@@ -369,6 +535,8 @@ class StandaloneGUI:
         self.last_touch_x = 0
         self.last_touch_y = 0
         self.last_touch_pressed = False
+        self._last_poll_ns = 0
+        self._min_poll_ns = 8_000_000  # 触摸屏最短读取间隔（8ms）
         
         # 触摸坐标映射参数
         self.touch_scale_x = 1.0
@@ -376,8 +544,27 @@ class StandaloneGUI:
         self.touch_offset_x = 0
         self.touch_offset_y = 0
         
+        # 界面上不随帧变化的文字：(y, 文字, 颜色)
+        detector_status = "Real Detection" if self.detector.has_face_detector else "Simulated"
+        help_y = height - 60
+        self._static_lines = [
+            (75, f"Detection: {detector_status}", _COLORS['gray']),
+            (95, "Touch Control Mode" if self.has_touchscreen else "Display Only Mode", _COLORS['orange']),
+        ]
+        if self.has_touchscreen:
+            self._static_lines += [
+                (help_y, "Touch Control Ready:", _COLORS['white']),
+                (help_y + 20, "Touch buttons to interact", _COLORS['green']),
+            ]
+        else:
+            self._static_lines += [
+                (help_y, "No Touch Control:", _COLORS['white']),
+                (help_y + 20, "Touchscreen not available", _COLORS['red']),
+            ]
+        
         # 自动检测和应用常见的坐标映射
         self._detect_touch_mapping()
+        self._update_touch_affine()
         
         # 手动控制模式
         self.manual_mode = True
@@ -412,72 +599,102 @@ class StandaloneGUI:
             print("  No registered persons")
         print()
     
+    def _button_draw_params(self):
+        """
+        计算所有按键本帧的绘制参数
+        
+        Returns:
+            list: [(x, y, w, h, color, text, active, text_x, text_y), ...]
+        """
+        params = []
+        append = params.append
+        recording_active = self.recording['active']
+        disabled_color = _COLORS['disabled']
+        for button in self._btn_list:
+            active = button['active']
+            # 按记录状态取预先绑定的配色和文字，再按点击状态取色
+            colors, text = button['styles'][recording_active]
+            color = colors[active] if button['enabled'] else disabled_color
+            
+            x = button['x']
+            y = button['y']
+            w = button['w']
+            h = button['h']
+            # 文字位置按文字内容缓存，按键几何变化时清空
+            text_cache = button['text_pos']
+            text_pos = text_cache.get(text)
+            if text_pos is None:
+                text_pos = (x + (w - len(text) * 8) // 2, y + (h - 16) // 2)
+                text_cache[text] = text_pos
+            
+            append((x, y, w, h, color, text, active, text_pos[0], text_pos[1]))
+        return params
+    
     def _draw_virtual_buttons(self, img):
         """
         绘制虚拟按键
+        按键状态变化时才重新绘制到叠加层，其余帧直接贴图
         
         Args:
             img: 图像对象
         """
-        for button_name, button in self.buttons.items():
-            x, y, w, h = button['x'], button['y'], button['w'], button['h']
-            
-            # 选择按键颜色
-            if button_name == 'record':
-                if self.recording['active']:
-                    if button['active']:
-                        color = image.Color.from_rgb(255, 255, 0)
-                    else:
-                        color = image.Color.from_rgb(200, 150, 0)
-                    text = 'Cancel'
-                else:
-                    if button['active']:
-                        color = image.Color.from_rgb(0, 255, 0)
-                    else:
-                        color = image.Color.from_rgb(0, 150, 0)
-                    text = 'Record'
-            
-            elif button_name == 'clear':
-                if button['enabled']:
-                    if button['active']:
-                        color = image.Color.from_rgb(255, 0, 0)
-                    else:
-                        color = image.Color.from_rgb(150, 0, 0)
-                else:
-                    color = image.Color.from_rgb(80, 80, 80)
-                text = 'Clear'
-            
-            try:
-                # 绘制按键背景
-                img.draw_rect(x, y, w, h, color=color, thickness=-1)
-                
-                # 绘制按键边框
-                border_color = image.Color.from_rgb(255, 255, 255)
-                img.draw_rect(x, y, w, h, color=border_color, thickness=2)
-                
-                # 绘制按键文字
-                text_x = x + (w - len(text) * 8) // 2
-                text_y = y + (h - 16) // 2
-                img.draw_string(text_x, text_y, text, 
-                              color=image.Color.from_rgb(255, 255, 255), scale=1.2)
-                
-                # 点击效果
-                if button['active']:
-                    inner_color = image.Color.from_rgb(255, 255, 255)
-                    img.draw_rect(x + 2, y + 2, w - 4, h - 4, 
-                                color=inner_color, thickness=1)
-                
-                # 调试模式：显示按键区域坐标
-                if self.debug_mode:
-                    debug_text = f"{x},{y}-{x+w},{y+h}"
-                    try:
-                        img.draw_string(x, y - 15, debug_text, 
-                                      color=image.Color.from_rgb(255, 255, 0), scale=0.8)
-                    except:
-                        pass
+        params = self._button_draw_params()
+        key = (tuple((id(color), text, active) for _, _, _, _, color, text, active, _, _ in params),
+               self.debug_mode)
+        
+        try:
+            if key != self._buttons_key:
+                self._render_button_overlay(params)
+                self._buttons_key = key
             
-            except Exception as e:
-                print(f"绘制按键错误: {e}")
+            img.draw_image(self._btn_origin[0], self._btn_origin[1], self._button_overlay)
+        
+        except Exception as e:
+            _log_error('buttons', f"绘制按键错误: {e}")
+    
+    def _render_button_overlay(self, params):
+        """
+        重新绘制按键叠加层
+        按图元分批绘制：先画所有背景，再画所有边框，最后画所有文字
+        
+        Args:
+            params: _button_draw_params() 返回的绘制参数
+        """
+        ox, oy = self._btn_origin
+        ow, oh = self._btn_overlay_size
+        if self._button_overlay is None:
+            self._button_overlay = image.Image(ow, oh, image.Format.FMT_RGBA8888)
+        overlay = self._button_overlay
+        draw_rect = overlay.draw_rect
+        draw_string = overlay.draw_string
+        border_color = _COLORS['white']
+        debug_color = _COLORS['yellow']
+        
+        # 透明背景
+        draw_rect(0, 0, ow, oh, color=_COLORS['transparent'], thickness=-1)
+        
+        # 按键背景
+        for x, y, w, h, color, _, _, _, _ in params:
+            draw_rect(x - ox, y - oy, w, h, color=color, thickness=-1)
+        
+        # 按键边框和点击效果
+        for x, y, w, h, _, _, active, _, _ in params:
+            draw_rect(x - ox, y - oy, w, h, color=border_color, thickness=2)
+            if active:
+                draw_rect(x - ox + 2, y - oy + 2, w - 4, h - 4, 
+                          color=border_color, thickness=1)
+        
+        # 按键文字
+        for _, _, _, _, _, text, _, text_x, text_y in params:
+            draw_string(text_x - ox, text_y - oy, text, 
+                        color=border_color, scale=1.2)
+        
+        # 调试模式：显示按键区域坐标
+        if self.debug_mode:
+            for x, y, w, h, _, _, _, _, _ in params:
+                debug_text = f"{x},{y}-{x+w},{y+h}"
+                draw_string(x - ox, y - 15 - oy, debug_text, 
+                            color=debug_color, scale=0.8)
     
     def _draw_ui_info(self, img):
         """
@@ -488,52 +705,31 @@ class StandaloneGUI:
         """
         try:
             # 主标题
-            title = "Face Recognition System"
-            img.draw_string(10, 10, title, 
-                          color=image.Color.from_rgb(255, 255, 255), scale=1.2)
+            img.draw_string(10, 10, "Face Recognition System", 
+                          color=_COLORS['white'], scale=1.2)
             
             # 系统状态
             status = self.recognizer.get_status_info()
             status_text = f"Registered: {status['registered_count']}/{status['max_persons']}"
             img.draw_string(10, 35, status_text, 
-                          color=image.Color.from_rgb(0, 255, 255))
+                          color=_COLORS['cyan'])
             
             # 当前模式
             if self.recording['active']:
                 mode_text = f"Recording: {self.recording['name']} ({self.recording['samples']}/{self.recording['max_samples']})"
-                mode_color = image.Color.from_rgb(255, 255, 0)
+                mode_color = _COLORS['yellow']
             else:
                 mode_text = "Live Detection Mode"
-                mode_color = image.Color.from_rgb(0, 255, 0)
+                mode_color = _COLORS['green']
             
             img.draw_string(10, 55, mode_text, color=mode_color)
             
-            # 检测状态
-            detector_status = "Real Detection" if self.detector.has_face_detector else "Simulated"
-            img.draw_string(10, 75, f"Detection: {detector_status}", 
-                          color=image.Color.from_rgb(128, 128, 128))
-            
-            # 控制模式信息
-            mode_text = "Touch Control Mode" if self.has_touchscreen else "Display Only Mode"
-            img.draw_string(10, 95, mode_text, 
-                          color=image.Color.from_rgb(255, 165, 0))
-            
-            # 操作提示
-            help_y = self.height - 60
-            # 控制状态提示
-            if self.has_touchscreen:
-                img.draw_string(10, help_y, "Touch Control Ready:", 
-                              color=image.Color.from_rgb(255, 255, 255))
-                img.draw_string(10, help_y + 20, "Touch buttons to interact", 
-                              color=image.Color.from_rgb(0, 255, 0))
-            else:
-                img.draw_string(10, help_y, "No Touch Control:", 
-                              color=image.Color.from_rgb(255, 255, 255))
-                img.draw_string(10, help_y + 20, "Touchscreen not available", 
-                              color=image.Color.from_rgb(255, 0, 0))
+            # 检测状态、控制模式和操作提示（初始化时已确定）
+            for y, text, color in self._static_lines:
+                img.draw_string(10, y, text, color=color)
             
         except Exception as e:
-            print(f"UI信息绘制错误: {e}")
+            _log_error('ui', f"UI信息绘制错误: {e}")
     
     def _detect_touch_mapping(self):
         """
@@ -565,6 +761,17 @@ class StandaloneGUI:
         
         print(f"Touch mapping: scale=({self.touch_scale_x:.3f}, {self.touch_scale_y:.3f}) offset=({self.touch_offset_x}, {self.touch_offset_y})")
     
+    def _update_touch_affine(self):
+        """
+        映射参数变化后重新计算仿射系数：(raw + offset) * scale = raw * scale + offset * scale
+        """
+        self._sx = self.touch_scale_x
+        self._sy = self.touch_scale_y
+        self._ox = self.touch_offset_x * self.touch_scale_x
+        self._oy = self.touch_offset_y * self.touch_scale_y
+        self._w1 = self.width - 1
+        self._h1 = self.height - 1
+    
     def _map_touch_coordinates(self, raw_x, raw_y):
         """
         映射原始触摸坐标到显示坐标
@@ -576,12 +783,18 @@ class StandaloneGUI:
         Returns:
             tuple: (映射后X坐标, 映射后Y坐标)
         """
-        mapped_x = int((raw_x + self.touch_offset_x) * self.touch_scale_x)
-        mapped_y = int((raw_y + self.touch_offset_y) * self.touch_scale_y)
+        mapped_x = int(raw_x * self._sx + self._ox)
+        mapped_y = int(raw_y * self._sy + self._oy)
         
         # 限制在显示范围内
-        mapped_x = max(0, min(mapped_x, self.width - 1))
-        mapped_y = max(0, min(mapped_y, self.height - 1))
+        if mapped_x < 0:
+            mapped_x = 0
+        elif mapped_x > self._w1:
+            mapped_x = self._w1
+        if mapped_y < 0:
+            mapped_y = 0
+        elif mapped_y > self._h1:
+            mapped_y = self._h1
         
         return mapped_x, mapped_y
     
@@ -597,6 +810,10 @@ class StandaloneGUI:
         """
         detections = self.detector.detect_persons(img)
         
+        run_recognition = self.frame_count % self.recog_interval == 0
+        if run_recognition:
+            self._last_results = []
+        
         if detections:
             for detection in detections:
                 bbox = detection['bbox']
@@ -605,10 +822,10 @@ class StandaloneGUI:
                 
                 # 选择框颜色
                 if self.recording['active']:
-                    box_color = image.Color.from_rgb(255, 255, 0)
+                    box_color = _COLORS['yellow']
                     thickness = 3
                 else:
-                    box_color = image.Color.from_rgb(0, 255, 0)
+                    box_color = _COLORS['green']
                     thickness = 2
                 
                 # 绘制检测框
@@ -618,29 +835,67 @@ class StandaloneGUI:
                     # 绘制人脸框
                     if face_bbox:
                         fx, fy, fw, fh = face_bbox
-                        face_color = image.Color.from_rgb(0, 255, 255)
-                        img.draw_rect(fx, fy, fw, fh, color=face_color, thickness=1)
+                        img.draw_rect(fx, fy, fw, fh, color=_COLORS['cyan'], thickness=1)
                 except:
                     pass
                 
                 # 识别并标注
                 if face_bbox and not self.recording['active']:
-                    person_id, confidence, person_name = self.recognizer.recognize_person(img, face_bbox)
+                    if run_recognition:
+                        result = self.recognizer.recognize_person(img, face_bbox)
+                        self._last_results.append((face_bbox, result))
+                    else:
+                        result = self._match_last_result(face_bbox)
+                        if result is None:
+                            # 上次识别时没有这个人脸，本帧不标注
+                            continue
+                    person_id, confidence, person_name = result
+                    
+                    # 标签完全在画面外时不再格式化文字
+                    label_y = y - 20
+                    if label_y <= -16 or x >= self.width:
+                        continue
                     
                     if person_id:
                         label = f"{person_name} ({confidence:.2f})"
-                        label_color = image.Color.from_rgb(255, 0, 0)
+                        label_color = _COLORS['red']
                     else:
                         label = f"Unknown ({confidence:.2f})"
-                        label_color = image.Color.from_rgb(255, 255, 255)
+                        label_color = _COLORS['white']
                     
                     try:
-                        img.draw_string(x, y - 20, label, color=label_color)
+                        img.draw_string(x, label_y, label, color=label_color)
                     except:
                         pass
         
         return detections
     
+    def _match_last_result(self, face_bbox):
+        """
+        按人脸框IoU查找上次识别的结果，检测顺序或数量变化时不会错配
+        
+        Args:
+            face_bbox: 当前人脸框 (x, y, w, h)
+            
+        Returns:
+            tuple: (person_id, confidence, person_name)，没有匹配时返回None
+        """
+        best_result, best_iou = None, self.track_iou_threshold
+        for last_bbox, result in self._last_results:
+            iou = self.detector.calculate_iou(face_bbox, last_bbox)
+            if iou > best_iou:
+                best_result, best_iou = result, iou
+        return best_result
+    
+    def set_poll_interval_ms(self, ms):
+        """
+        设置触摸屏最短读取间隔
+        
+        Args:
+            ms: 间隔毫秒数，0 表示每次都读取
+        """
+        self._min_poll_ns = max(0, int(ms * 1_000_000))
+    
     def _check_manual_control(self):
         """
         检查手动控制 - 真实触摸检测
@@ -651,51 +906,57 @@ class StandaloneGUI:
         if not self.has_touchscreen:
             return None
         
+        # 距上次读取不足最短间隔时跳过，触摸状态沿用上次结果
+        now = time.monotonic_ns()
+        if now - self._last_poll_ns < self._min_poll_ns:
+            return None
+        self._last_poll_ns = now
+        
+        # 只有读取触摸屏可能出错，其余处理放在 try 之外
         try:
-            # 读取触摸屏状态
             raw_x, raw_y, pressed = self.ts.read()
-            
-            # 映射触摸坐标
-            x, y = self._map_touch_coordinates(raw_x, raw_y)
-            
-            # 检查触摸状态变化 - 添加调试信息
-            if x != self.last_touch_x or y != self.last_touch_y or pressed != self.last_touch_pressed:
-                if pressed != self.last_touch_pressed:  # 按压状态变化时打印
-                    print(f"Touch state: raw({raw_x}, {raw_y}) -> mapped({x}, {y}) pressed={pressed}")
-                self.last_touch_x = x
-                self.last_touch_y = y
-                self.last_touch_pressed = pressed
-            
-            # 处理触摸事件
-            if pressed:
-                self.touch_pressed_already = True
-                # 在图像上显示触摸点（如果可能）
-                # 这会在主循环的图像上绘制，但由于时机问题可能看不到
-            else:
-                # 触摸释放时检查是否点击了按键
-                if self.touch_pressed_already:
-                    print(f"Touch released at: ({x}, {y})")
-                    self.touch_pressed_already = False
-                    
-                    # 添加按键区域调试信息
-                    print(f"Checking button areas:")
-                    for btn_name, btn in self.buttons.items():
-                        btn_x, btn_y, btn_w, btn_h = btn['x'], btn['y'], btn['w'], btn['h']
-                        x2, y2 = btn_x + btn_w, btn_y + btn_h
-                        enabled = btn.get('enabled', True)
-                        print(f"  {btn_name}: ({btn_x},{btn_y}) to ({x2},{y2}) enabled={enabled}")
-                    
-                    button_clicked = self._check_virtual_button_touch(x, y)
-                    if button_clicked:
-                        print(f"✓ Touch detected: {button_clicked} at ({x}, {y})")
-                        return button_clicked
-                    else:
-                        print(f"✗ Touch outside button areas at ({x}, {y})")
-        
         except Exception as e:
-            print(f"Touch detection error: {e}")
+            _log_error('touch', f"Touch detection error: {e}")
+            return None
         
-        return None
+        # 映射触摸坐标
+        x, y = self._map_touch_coordinates(raw_x, raw_y)
+        
+        # 检查触摸状态变化 - 添加调试信息
+        if x != self.last_touch_x or y != self.last_touch_y or pressed != self.last_touch_pressed:
+            if self.debug_mode and pressed != self.last_touch_pressed:  # 按压状态变化时打印
+                print(f"Touch state: raw({raw_x}, {raw_y}) -> mapped({x}, {y}) pressed={pressed}")
+            self.last_touch_x = x
+            self.last_touch_y = y
+            self.last_touch_pressed = pressed
+        
+        # 处理触摸事件
+        if pressed:
+            self.touch_pressed_already = True
+            # 在图像上显示触摸点（如果可能）
+            # 这会在主循环的图像上绘制，但由于时机问题可能看不到
+            return None
+        
+        # 触摸释放时检查是否点击了按键
+        if not self.touch_pressed_already:
+            return None
+        self.touch_pressed_already = False
+        
+        if self.debug_mode:
+            print(f"Touch released at: ({x}, {y})")
+            
+            # 添加按键区域调试信息
+            print(f"Checking button areas:")
+            for btn_name, btn in self.buttons.items():
+                enabled = btn.get('enabled', True)
+                print(f"  {btn_name}: ({btn['x']},{btn['y']}) to ({btn['x2']},{btn['y2']}) enabled={enabled}")
+        
+        button_clicked = self._check_virtual_button_touch(x, y)
+        if button_clicked:
+            print(f"✓ Touch detected: {button_clicked} at ({x}, {y})")
+        elif self.debug_mode:
+            print(f"✗ Touch outside button areas at ({x}, {y})")
+        return button_clicked
     
     def _check_virtual_button_touch(self, touch_x, touch_y):
         """
@@ -708,18 +969,58 @@ class StandaloneGUI:
         Returns:
             str: 按键名称，如果不在按键区域则返回None
         """
-        for button_name, button in self.buttons.items():
-            x, y, w, h = button['x'], button['y'], button['w'], button['h']
-            
-            # 检查触摸点是否在按键区域内
-            if (x <= touch_x <= x + w and 
-                y <= touch_y <= y + h and 
-                button['enabled']):
-                
+        if _HAS_NUMBA:
+            enabled = np.array([b['enabled'] for b in self._btn_list], dtype=np.bool_)
+            idx = _hit_kernel(self._btn_rects, enabled, touch_x, touch_y)
+            return self._btn_ids[idx] if idx >= 0 else None
+        
+        rects = self._btn_rects
+        if rects is not None:
+            btn_list = self._btn_list
+            mask = ((rects[:, 0] <= touch_x) & (touch_x <= rects[:, 2]) &
+                    (rects[:, 1] <= touch_y) & (touch_y <= rects[:, 3]))
+            for idx in np.flatnonzero(mask):
+                if btn_list[idx]['enabled']:
+                    return self._btn_ids[idx]
+            return None
+        
+        for button_name, button in self._btn_items:
+            # 先判断是否可用，再用预先算好的右下角坐标比较
+            if (button['enabled'] and
+                    button['x'] <= touch_x <= button['x2'] and
+                    button['y'] <= touch_y <= button['y2']):
                 return button_name
         
         return None
     
+    def _rebuild_button_arrays(self):
+        """
+        按键位置或尺寸变化后重新计算右下角坐标和叠加层范围，并重建按键矩形数组 (x, y, x2, y2)
+        """
+        for button in self.buttons.values():
+            button['x2'] = button['x'] + button['w']
+            button['y2'] = button['y'] + button['h']
+            button['text_pos'] = {}  # 文字 -> (text_x, text_y)
+        
+        # 按键叠加层：从最左侧按键到屏幕右边缘，向上留出调试坐标文字的位置
+        ox = min(b['x'] for b in self.buttons.values())
+        oy = max(0, min(b['y'] for b in self.buttons.values()) - 15)
+        self._btn_origin = (ox, oy)
+        self._btn_overlay_size = (self.width - ox, max(b['y2'] for b in self.buttons.values()) - oy + 1)
+        self._button_overlay = None
+        self._buttons_key = None
+        
+        # 每帧遍历用的列表，避免反复创建字典视图
+        self._btn_ids = list(self.buttons.keys())
+        self._btn_list = list(self.buttons.values())
+        self._btn_items = list(self.buttons.items())
+        if np is None:
+            self._btn_rects = None
+            return
+        self._btn_rects = np.array(
+            [(b['x'], b['y'], b['x2'], b['y2']) for b in self.buttons.values()],
+            dtype=np.int32).reshape(-1, 4)
+    
     def _handle_button_click(self, button_name, detections):
         """
         处理按键点击
@@ -728,14 +1029,14 @@ class StandaloneGUI:
             button_name: 按键名称
             detections: 当前检测结果
         """
-        current_time = time.time()
+        now = time.monotonic_ns()
         button = self.buttons[button_name]
         
         # 检查点击冷却
-        if current_time - button['last_click'] < self.click_cooldown:
+        if now - button['last_click_ns'] < self._click_cooldown_ns:
             return
         
-        button['last_click'] = current_time
+        button['last_click_ns'] = now
         button['active'] = True
         
         if button_name == 'record':
@@ -764,14 +1065,18 @@ class StandaloneGUI:
         """
         开始记录新人物
         """
-        person_count = len(self.recognizer.get_registered_persons())
+        # 使用未被占用的最小编号命名，删除人物后不会与现有姓名重复
+        names = {info['name'] for info in self.recognizer.get_registered_persons().values()}
+        number = 1
+        while f"Person{number}" in names:
+            number += 1
         
         self.recording.update({
             'active': True,
-            'name': f"Person{person_count + 1}",
+            'name': f"Person{number}",
             'samples': 0,
             'person_id': None,
-            'last_sample_time': time.time()
+            'last_sample_ns': time.monotonic_ns()
         })
     
     def _cancel_recording(self):
@@ -801,10 +1106,10 @@ class StandaloneGUI:
         if not self.recording['active'] or not detections:
             return
         
-        current_time = time.time()
+        now = time.monotonic_ns()
         
         # 控制采样频率
-        if current_time - self.recording['last_sample_time'] < self.recording['sample_interval']:
+        if now - self.recording['last_sample_ns'] < self.recording['sample_interval_ns']:
             return
         
         # 使用第一个检测结果
@@ -822,7 +1127,7 @@ class StandaloneGUI:
                     print(f"✓ {message}")
                     self.recording['person_id'] = person_id
                     self.recording['samples'] = 1
-                    self.recording['last_sample_time'] = current_time
+                    self.recording['last_sample_ns'] = now
                 else:
                     print(f"✗ {message}")
                     self._cancel_recording()
@@ -837,7 +1142,7 @@ class StandaloneGUI:
                 if success:
                     print(f"✓ {message}")
                     self.recording['samples'] += 1
-                    self.recording['last_sample_time'] = current_time
+                    self.recording['last_sample_ns'] = now
                     
                     # Check if complete
                     if self.recording['samples'] >= self.recording['max_samples']:
@@ -873,11 +1178,11 @@ class StandaloneGUI:
         """
         更新按键状态
         """
-        current_time = time.time()
+        now = time.monotonic_ns()
         
         # 重置按键激活状态
-        for button in self.buttons.values():
-            if button['active'] and current_time - button['last_click'] > 0.2:
+        for button in self._btn_list:
+            if button['active'] and now - button['last_click_ns'] > self._active_release_ns:
                 button['active'] = False
         
         # 更新清除按键可用状态
@@ -926,13 +1231,12 @@ class StandaloneGUI:
                 self._draw_virtual_buttons(img)
                 
                 # 绘制触摸点（如果正在触摸）
-                if self.has_touchscreen and hasattr(self, 'last_touch_x') and hasattr(self, 'last_touch_y'):
-                    if self.touch_pressed_already:
-                        try:
-                            img.draw_circle(self.last_touch_x, self.last_touch_y, 5, 
-                                          image.Color.from_rgb(255, 255, 255), 2)
-                        except:
-                            pass
+                if self.has_touchscreen and self.touch_pressed_already:
+                    try:
+                        img.draw_circle(self.last_touch_x, self.last_touch_y, 5, 
+                                      _COLORS['white'], 2)
+                    except:
+                        pass
                 
                 # 显示画面
                 self.disp.show(img)
@@ -960,8 +1264,9 @@ def main():
     print("No external dependencies, ready to use")
     print()
     
-    # Parse command line arguments
+    # Parse command line arguments: [width] [height] [touch poll interval ms]
     width, height = 512, 320
+    poll_ms = None
     
     if len(sys.argv) > 1:
         try:
@@ -971,11 +1276,20 @@ def main():
         except ValueError:
             print("Invalid resolution parameters, using default 512x320")
     
+    if len(sys.argv) > 3:
+        try:
+            poll_ms = float(sys.argv[3])
+        except ValueError:
+            print("Invalid touch poll interval, using default 8ms")
+    
     print(f"Resolution: {width}x{height}")
     
     # Create and run GUI
     try:
         gui = StandaloneGUI(width, height)
+        if poll_ms is not None:
+            gui.set_poll_interval_ms(poll_ms)
+            print(f"Touch poll interval: {poll_ms}ms")
         gui.run()
     except Exception as e:
         print(f"GUI startup failed: {e}")
@@ -26,7 +26,7 @@ def debug_image_api():
         return
     
     print(f"图像类型: {type(img)}")
-    print(f"图像尺寸: {img.width} x {img.height}")
+    print(f"图像尺寸: {img.width()} x {img.height()}")
     
     # 测试可用的绘制方法
     methods_to_test = [
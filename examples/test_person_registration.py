@@ -13,6 +13,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.vision.recognition.face_recognition import PersonRecognizer
 from src.vision.detection.person_detector import PersonDetector
+from src.utils.fast_overlay import draw_boxes_labels, draw_text_cached
 
 class PersonRegistrationTest:
     """
@@ -42,6 +43,22 @@ class PersonRegistrationTest:
         self.current_mode = "detect"  # detect, register, recognize
         self.registration_name = ""
         
+        # 模式分发表：模式 -> 处理函数 / 操作提示
+        self._mode_handlers = {
+            "detect": self._handle_detection_mode,
+            "register": self._handle_register_mode,
+            "recognize": self._handle_recognize_mode
+        }
+        self._mode_hints = {
+            "detect": "按键: R-注册 T-识别 Q-退出",
+            "register": "注册模式: {name} 按S保存 C取消",
+            "recognize": "识别模式: 按D返回检测"
+        }
+        
+        # 界面文字叠加层：模式/提示/注册数变化时才重新绘制，其余帧直接贴图
+        self._ui_overlay = None
+        self._ui_overlay_key = None
+        
     def _show_system_status(self):
         """
         显示系统状态
@@ -75,30 +92,42 @@ class PersonRegistrationTest:
             img: 图像对象
         """
         try:
-            # 模式信息
-            mode_text = f"模式: {self.current_mode}"
-            img.draw_string(10, 10, mode_text, color=image.Color.from_rgb(255, 255, 255))
-            
-            # 操作提示
-            if self.current_mode == "detect":
-                hint = "按键: R-注册 T-识别 Q-退出"
-            elif self.current_mode == "register":
-                hint = f"注册模式: {self.registration_name} 按S保存 C取消"
-            elif self.current_mode == "recognize":
-                hint = "识别模式: 按D返回检测"
-            else:
-                hint = ""
+            key = (self.current_mode, self.registration_name,
+                   len(self.recognizer.registered_persons))
+            if key != self._ui_overlay_key:
+                self._render_ui_overlay()
+                self._ui_overlay_key = key
             
-            img.draw_string(10, 25, hint, color=image.Color.from_rgb(255, 255, 0))
-            
-            # 状态信息
-            status = self.recognizer.get_status_info()
-            status_text = f"注册: {status['registered_count']}/{status['max_persons']}"
-            img.draw_string(10, 40, status_text, color=image.Color.from_rgb(0, 255, 255))
+            img.draw_image(0, 0, self._ui_overlay)
             
         except Exception as e:
             print(f"UI绘制错误: {e}")
     
+    def _render_ui_overlay(self):
+        """
+        重新绘制界面文字叠加层
+        """
+        if self._ui_overlay is None:
+            self._ui_overlay = image.Image(320, 60, image.Format.FMT_RGBA8888)
+        overlay = self._ui_overlay
+        
+        # 透明背景
+        overlay.draw_rect(0, 0, 320, 60, color=image.Color.from_rgba(0, 0, 0, 0), thickness=-1)
+        
+        # 模式信息
+        mode_text = f"模式: {self.current_mode}"
+        overlay.draw_string(10, 10, mode_text, color=image.Color.from_rgb(255, 255, 255))
+        
+        # 操作提示
+        hint = self._mode_hints.get(self.current_mode, "").format(name=self.registration_name)
+        
+        overlay.draw_string(10, 25, hint, color=image.Color.from_rgb(255, 255, 0))
+        
+        # 状态信息
+        status = self.recognizer.get_status_info()
+        status_text = f"注册: {status['registered_count']}/{status['max_persons']}"
+        overlay.draw_string(10, 40, status_text, color=image.Color.from_rgb(0, 255, 255))
+    
     def _handle_detection_mode(self, img):
         """
         处理检测模式
@@ -116,22 +145,23 @@ class PersonRegistrationTest:
             # 绘制检测框
             img = self.detector.draw_green_boxes(img, detections)
             
-            # 尝试识别已注册的人物
-            for detection in detections:
+            # 尝试识别已注册的人物：一次批量识别本帧所有人脸，循环中按检测结果取用
+            reco_results = self.recognizer.recognize_detections(img, detections)
+            
+            for detection, reco_result in zip(detections, reco_results):
                 bbox = detection['bbox']
                 x, y, w, h = bbox
                 
                 # 使用人脸区域进行识别
                 face_bbox = detection.get('face_bbox')
                 if face_bbox:
-                    person_id, confidence, person_name = self.recognizer.recognize_person(img, face_bbox)
+                    person_id, confidence, person_name = reco_result
                     
                     if person_id:
-                        # 绘制识别结果
+                        # 绘制识别结果（文字贴图缓存，同一标签只渲染一次）
                         try:
                             recognition_text = f"{person_name} ({confidence:.2f})"
-                            img.draw_string(x, y - 20, recognition_text, 
-                                          color=image.Color.from_rgb(255, 0, 0))
+                            draw_text_cached(img, x, max(y - 20, 0), recognition_text, (255, 0, 0))
                         except:
                             pass
         
@@ -184,29 +214,24 @@ class PersonRegistrationTest:
         detections = self.detector.detect_persons(img)
         
         if detections:
-            for detection in detections:
-                bbox = detection['bbox']
-                face_bbox = detection.get('face_bbox')
-                x, y, w, h = bbox
-                
-                if face_bbox:
-                    # 进行人物识别
-                    person_id, confidence, person_name = self.recognizer.recognize_person(img, face_bbox)
-                    
-                    if person_id:
-                        # 已知人物 - 红色框
-                        color = image.Color.from_rgb(255, 0, 0)
-                        result_text = f"{person_name} ({confidence:.3f})"
-                    else:
-                        # 未知人物 - 蓝色框
-                        color = image.Color.from_rgb(0, 0, 255)
-                        result_text = f"未知 ({confidence:.3f})"
-                    
-                    try:
-                        img.draw_rect(x, y, w, h, color=color, thickness=3)
-                        img.draw_string(x, y - 20, result_text, color=color)
-                    except:
-                        pass
+            # 批量识别所有带人脸框的检测结果
+            faces = [d for d in detections if d.get('face_bbox')]
+            results = self.recognizer.recognize_persons_batch(img, [d['face_bbox'] for d in faces])
+            
+            labels = []
+            colors = []
+            for person_id, confidence, person_name in results:
+                if person_id:
+                    # 已知人物 - 红色框
+                    colors.append((255, 0, 0))
+                    labels.append(f"{person_name} ({confidence:.3f})")
+                else:
+                    # 未知人物 - 蓝色框
+                    colors.append((0, 0, 255))
+                    labels.append(f"未知 ({confidence:.3f})")
+            
+            # 所有框和标签统一交给 draw_boxes_labels 绘制
+            draw_boxes_labels(img, [d['bbox'] for d in faces], labels, colors, thickness=3)
         
         return img
     
@@ -236,12 +261,9 @@ class PersonRegistrationTest:
                 frame_count += 1
                 
                 # 根据当前模式处理图像
-                if self.current_mode == "detect":
-                    img = self._handle_detection_mode(img)
-                elif self.current_mode == "register":
-                    img = self._handle_register_mode(img)
-                elif self.current_mode == "recognize":
-                    img = self._handle_recognize_mode(img)
+                handler = self._mode_handlers.get(self.current_mode)
+                if handler is not None:
+                    img = handler(img)
                 
                 # 绘制UI信息
                 self._draw_ui_info(img)
@@ -346,10 +368,13 @@ class PersonRegistrationTest:
                 detections = self.detector.detect_persons(img)
                 
                 if detections:
-                    for detection in detections:
+                    # 一次批量识别本帧所有人脸，循环中按检测结果取用
+                    reco_results = self.recognizer.recognize_detections(img, detections)
+                    
+                    for detection, reco_result in zip(detections, reco_results):
                         face_bbox = detection.get('face_bbox')
                         if face_bbox:
-                            person_id, confidence, person_name = self.recognizer.recognize_person(img, face_bbox)
+                            person_id, confidence, person_name = reco_result
                             
                             result = {
                                 'frame': i+1,
@@ -130,10 +130,11 @@ def test_static_image(image_path):
     
     try:
         img = image.load(image_path)
-        detector = PersonDetector(camera_width=img.width, camera_height=img.height)
+        img_w, img_h = img.width(), img.height()
+        detector = PersonDetector(camera_width=img_w, camera_height=img_h)
         
         # 显示图像信息
-        print(f"图像尺寸: {img.width}x{img.height}")
+        print(f"图像尺寸: {img_w}x{img_h}")
         
         # 检测人物
         detections = detector.detect_persons(img)
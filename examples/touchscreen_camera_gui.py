@@ -7,22 +7,47 @@
 
 import sys
 import os
+import gc
 import time
+import threading
+import numpy as np
 from maix import camera, display, app, image, touchscreen
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.vision.recognition.face_recognition import PersonRecognizer
 from src.vision.detection.person_detector import PersonDetector
+from src.vision.recognition.recognizer_worker import RecognizerWorker
+from src.utils.fast_overlay import draw_boxes_labels
+
+# 界面常用颜色，模块加载时创建一次，避免每帧重复构造
+_COLORS = {
+    'white': image.Color.from_rgb(255, 255, 255),
+    'red': image.Color.from_rgb(255, 0, 0),
+    'green': image.Color.from_rgb(0, 255, 0),
+    'cyan': image.Color.from_rgb(0, 255, 255),
+    'yellow': image.Color.from_rgb(255, 255, 0),
+    'orange': image.Color.from_rgb(255, 165, 0),
+    'gray': image.Color.from_rgb(128, 128, 128),
+    'disabled': image.Color.from_rgb(100, 100, 100),
+    'record': image.Color.from_rgb(0, 150, 0),
+    'cancel': image.Color.from_rgb(150, 100, 0),
+    'clear': image.Color.from_rgb(150, 0, 0),
+    'transparent': image.Color.from_rgba(0, 0, 0, 0),
+}
 
 class TouchscreenCameraGUI:
     """
     触摸屏虚拟按键摄像头界面
     """
     
-    def __init__(self):
+    def __init__(self, use_recognizer_worker=False, use_capture_thread=False):
         """
         初始化界面
+        
+        Args:
+            use_recognizer_worker: 是否在独立进程中运行人物识别
+            use_capture_thread: 是否在独立线程中采集摄像头画面
         """
         # 硬件初始化
         self.cam = camera.Camera(512, 320)
@@ -40,33 +65,74 @@ class TouchscreenCameraGUI:
             self.has_touchscreen = False
         
         # 功能模块
-        self.detector = PersonDetector(camera_width=512, camera_height=320)
+        # 在256x160的缩小图上检测，显示和识别仍使用原图
+        self.detector = PersonDetector(camera_width=512, camera_height=320, detect_scale=2)
         self.recognizer = PersonRecognizer()
         
+        # 识别工作进程（可选），未完成时沿用跟踪缓存中的识别结果
+        self.recognizer_worker = None
+        self._pending_tracks = []
+        if use_recognizer_worker:
+            worker = RecognizerWorker(512, 320)
+            if worker.start():
+                self.recognizer_worker = worker
+                print("✓ 识别工作进程已启动")
+        
+        # 采集线程（可选）：采集与处理/显示并行
+        # 只保留最新一帧的引用，处理跟不上时旧帧直接被覆盖，交接时不复制图像
+        self.use_capture_thread = use_capture_thread
+        self._frame_cond = threading.Condition()
+        self._latest_frame = None
+        self._stop_evt = threading.Event()
+        self._capture_thread = None
+        
+        # 检测间隔：中间帧复用上次检测结果
+        self.det_stride = 3
+        self._last_detections = None
+        
+        # 人物跟踪缓存：track_id -> {'bbox', 'person_id', 'name', 'conf', 'last_reco_frame', 'label', ...}
+        self._tracks = {}
+        self._next_track_id = 0
+        self.track_iou_threshold = 0.4  # 同一目标的最小IoU
+        self.reco_interval = 10         # 同一目标每隔多少帧重新识别
+        self.reco_min_conf = 0.6        # 置信度低于该值时每帧重新识别
+        
         # 虚拟按键配置
         self.buttons = {
             'record': {
                 'x': 400, 'y': 250, 'w': 100, 'h': 40,
                 'text': '记录',
-                'color_normal': image.Color.from_rgb(0, 150, 0),
-                'color_pressed': image.Color.from_rgb(0, 255, 0),
-                'color_disabled': image.Color.from_rgb(100, 100, 100),
-                'text_color': image.Color.from_rgb(255, 255, 255),
+                'color_normal': _COLORS['record'],
+                'color_pressed': _COLORS['green'],
+                'color_disabled': _COLORS['disabled'],
+                'text_color': _COLORS['white'],
                 'pressed': False,
                 'enabled': True
             },
             'clear': {
                 'x': 400, 'y': 300, 'w': 100, 'h': 40,
                 'text': '清除',
-                'color_normal': image.Color.from_rgb(150, 0, 0),
-                'color_pressed': image.Color.from_rgb(255, 0, 0),
-                'color_disabled': image.Color.from_rgb(100, 100, 100),
-                'text_color': image.Color.from_rgb(255, 255, 255),
+                'color_normal': _COLORS['clear'],
+                'color_pressed': _COLORS['red'],
+                'color_disabled': _COLORS['disabled'],
+                'text_color': _COLORS['white'],
                 'pressed': False,
                 'enabled': True
             }
         }
         
+        # 按键几何信息按列存放，触摸命中检测一次比较所有按键
+        self._btn_ids = list(self.buttons.keys())
+        self._btn_xs = np.array([b['x'] for b in self.buttons.values()], dtype=np.int32)
+        self._btn_ys = np.array([b['y'] for b in self.buttons.values()], dtype=np.int32)
+        self._btn_x2s = self._btn_xs + np.array([b['w'] for b in self.buttons.values()], dtype=np.int32)
+        self._btn_y2s = self._btn_ys + np.array([b['h'] for b in self.buttons.values()], dtype=np.int32)
+        
+        # 按键叠加层：覆盖所有按键的最小区域，按键状态变化时才重新绘制
+        self._btn_origin = (int(self._btn_xs.min()), int(self._btn_ys.min()))
+        self._button_overlay = None
+        self._buttons_key = None
+        
         # 触摸状态
         self.touch_state = {
             'last_touch_time': 0,
@@ -88,9 +154,27 @@ class TouchscreenCameraGUI:
         
         # 界面状态
         self.frame_count = 0
-        self.fps_counter = 0
-        self.fps_start_time = time.time()
         self.current_fps = 0
+        self._fps_text = "FPS: 0.0"
+        self.target_fps = 30
+        self.frame_period = 1.0 / self.target_fps
+        self.touch_poll_interval = 0.05  # 触摸屏最多每50ms读取一次（约20Hz）
+        self._last_touch_poll = 0.0
+        
+        # FPS：帧间隔（纳秒整数）做指数滑动平均（系数1/8），每0.5秒换算一次显示值
+        self._frame_ns_ema = 0
+        self._last_frame_ns = None
+        self._fps_publish_ns = time.monotonic_ns()
+        
+        # 帧循环错误日志的上次打印时间
+        self._err_log_last = 0.0
+        
+        # 界面文字缓存：文字内容变化时才重新绘制到叠加层
+        self._ui_overlay = None
+        self._ui_overlay_key = None
+        self._ui_overlay_size = (240, 260)
+        self._ui_interval_ns = 200_000_000  # 界面文字最多每0.2秒检查一次
+        self._ui_last_ns = 0
         
         # 模拟触摸演示（当没有真实触摸屏时）
         self.demo_mode = not self.has_touchscreen
@@ -127,15 +211,53 @@ class TouchscreenCameraGUI:
                 print(f"    {info['name']} (样本: {info['feature_count']})")
         print()
     
+    def _log_error(self, message):
+        """
+        打印帧循环中的错误，每秒最多一次，避免刷屏
+        
+        Args:
+            message: 错误信息
+        """
+        now = time.monotonic()
+        if now - self._err_log_last >= 1.0:
+            print(message)
+            self._err_log_last = now
+    
     def _draw_virtual_buttons(self, img):
         """
         绘制虚拟按键
+        按键状态变化时才重新绘制到叠加层，其余帧直接贴图
         
         Args:
             img: 图像对象
         """
+        key = tuple((b['text'], b['pressed'], b['enabled'], id(b['color_normal']))
+                    for b in self.buttons.values())
+        if key != self._buttons_key:
+            self._render_button_overlay()
+            self._buttons_key = key
+        
+        try:
+            img.draw_image(self._btn_origin[0], self._btn_origin[1], self._button_overlay)
+        except Exception as e:
+            self._log_error(f"绘制按键错误: {e}")
+    
+    def _render_button_overlay(self):
+        """
+        重新绘制按键叠加层
+        """
+        ox, oy = self._btn_origin
+        w = int(self._btn_x2s.max()) - ox
+        h = int(self._btn_y2s.max()) - oy
+        if self._button_overlay is None:
+            self._button_overlay = image.Image(w, h, image.Format.FMT_RGBA8888)
+        overlay = self._button_overlay
+        
+        # 透明背景
+        overlay.draw_rect(0, 0, w, h, color=_COLORS['transparent'], thickness=-1)
+        
         for button_name, button in self.buttons.items():
-            x, y, w, h = button['x'], button['y'], button['w'], button['h']
+            x, y, w, h = button['x'] - ox, button['y'] - oy, button['w'], button['h']
             
             # 选择按键颜色
             if not button['enabled']:
@@ -147,81 +269,145 @@ class TouchscreenCameraGUI:
             
             try:
                 # 绘制按键背景
-                img.draw_rect(x, y, w, h, color=color, thickness=-1)
+                overlay.draw_rect(x, y, w, h, color=color, thickness=-1)
                 
                 # 绘制按键边框
-                border_color = image.Color.from_rgb(255, 255, 255)
-                img.draw_rect(x, y, w, h, color=border_color, thickness=2)
+                overlay.draw_rect(x, y, w, h, color=_COLORS['white'], thickness=2)
                 
                 # 绘制按键文字
                 text_x = x + (w - len(button['text']) * 8) // 2
                 text_y = y + (h - 16) // 2
-                img.draw_string(text_x, text_y, button['text'], 
-                              color=button['text_color'], scale=1.5)
+                overlay.draw_string(text_x, text_y, button['text'], 
+                                  color=button['text_color'], scale=1.5)
                 
                 # 如果按键被禁用，添加禁用标记
                 if not button['enabled']:
-                    img.draw_line(x, y, x + w, y + h, 
-                                color=image.Color.from_rgb(255, 0, 0), thickness=3)
-                    img.draw_line(x + w, y, x, y + h, 
-                                color=image.Color.from_rgb(255, 0, 0), thickness=3)
+                    overlay.draw_line(x, y, x + w, y + h, 
+                                    color=_COLORS['red'], thickness=3)
+                    overlay.draw_line(x + w, y, x, y + h, 
+                                    color=_COLORS['red'], thickness=3)
             
             except Exception as e:
-                print(f"绘制按键 {button_name} 错误: {e}")
+                self._log_error(f"绘制按键 {button_name} 错误: {e}")
     
     def _draw_ui_info(self, img):
         """
         绘制界面信息
+        文字最多每0.2秒检查一次，内容变化时才重新绘制到叠加层，其余帧直接贴图
         
         Args:
             img: 图像对象
         """
         try:
-            # 主标题
-            title = "触摸屏人脸识别"
-            img.draw_string(10, 10, title, 
-                          color=image.Color.from_rgb(255, 255, 255), scale=1.2)
+            now = time.monotonic_ns()
+            if self._ui_overlay is not None and now - self._ui_last_ns < self._ui_interval_ns:
+                img.draw_image(0, 0, self._ui_overlay)
+                return
+            self._ui_last_ns = now
             
             # 系统状态
             status = self.recognizer.get_status_info()
             status_text = f"人物: {status['registered_count']}/{status['max_persons']}"
-            img.draw_string(10, 35, status_text, 
-                          color=image.Color.from_rgb(0, 255, 255))
             
             # 当前模式
             if self.recording['active']:
                 mode_text = f"记录: {self.recording['name']} ({self.recording['samples']}/{self.recording['max_samples']})"
-                mode_color = image.Color.from_rgb(255, 255, 0)
             else:
                 mode_text = "实时模式"
-                mode_color = image.Color.from_rgb(0, 255, 0)
-            
-            img.draw_string(10, 55, mode_text, color=mode_color)
-            
-            # FPS显示
-            fps_text = f"FPS: {self.current_fps:.1f}"
-            img.draw_string(10, 75, fps_text, 
-                          color=image.Color.from_rgb(128, 128, 128))
             
-            # 触摸状态（演示模式）
-            if self.demo_mode:
-                demo_text = "演示模式 - 自动触摸"
-                img.draw_string(10, 95, demo_text, 
-                              color=image.Color.from_rgb(255, 165, 0))
+            key = (status_text, mode_text, self._fps_text)
+            if key != self._ui_overlay_key:
+                self._render_ui_overlay(status_text, mode_text, self._fps_text)
+                self._ui_overlay_key = key
             
-            # 操作说明
-            help_y = 200
-            img.draw_string(10, help_y, "操作说明:", 
-                          color=image.Color.from_rgb(255, 255, 255))
-            img.draw_string(10, help_y + 20, "点击右侧按键进行操作", 
-                          color=image.Color.from_rgb(255, 255, 0))
-            
-            if self.demo_mode:
-                img.draw_string(10, help_y + 40, "当前为演示模式", 
-                              color=image.Color.from_rgb(255, 165, 0))
+            img.draw_image(0, 0, self._ui_overlay)
         
         except Exception as e:
-            print(f"UI信息绘制错误: {e}")
+            self._log_error(f"UI信息绘制错误: {e}")
+    
+    def _render_ui_overlay(self, status_text, mode_text, fps_text):
+        """
+        重新绘制界面文字叠加层
+        
+        Args:
+            status_text: 人物数量文字
+            mode_text: 模式文字
+            fps_text: FPS文字
+        """
+        w, h = self._ui_overlay_size
+        if self._ui_overlay is None:
+            self._ui_overlay = image.Image(w, h, image.Format.FMT_RGBA8888)
+        overlay = self._ui_overlay
+        
+        # 透明背景
+        overlay.draw_rect(0, 0, w, h, color=_COLORS['transparent'], thickness=-1)
+        
+        # 主标题
+        overlay.draw_string(10, 10, "触摸屏人脸识别", 
+                          color=_COLORS['white'], scale=1.2)
+        
+        overlay.draw_string(10, 35, status_text, 
+                          color=_COLORS['cyan'])
+        
+        if self.recording['active']:
+            mode_color = _COLORS['yellow']
+        else:
+            mode_color = _COLORS['green']
+        overlay.draw_string(10, 55, mode_text, color=mode_color)
+        
+        overlay.draw_string(10, 75, fps_text, 
+                          color=_COLORS['gray'])
+        
+        # 触摸状态（演示模式）
+        if self.demo_mode:
+            overlay.draw_string(10, 95, "演示模式 - 自动触摸", 
+                              color=_COLORS['orange'])
+        
+        # 操作说明
+        help_y = 200
+        overlay.draw_string(10, help_y, "操作说明:", 
+                          color=_COLORS['white'])
+        overlay.draw_string(10, help_y + 20, "点击右侧按键进行操作", 
+                          color=_COLORS['yellow'])
+        
+        if self.demo_mode:
+            overlay.draw_string(10, help_y + 40, "当前为演示模式", 
+                              color=_COLORS['orange'])
+    
+    def _capture_loop(self):
+        """
+        采集线程：持续读取摄像头画面，发布为最新帧
+        """
+        while not self._stop_evt.is_set():
+            try:
+                img = self.cam.read()
+            except Exception as e:
+                self._log_error(f"摄像头读取错误: {e}")
+                time.sleep(0.01)
+                continue
+            if img is None:
+                # 暂无新帧时让出CPU，避免空转占满一个核心
+                time.sleep(0.001)
+                continue
+            
+            with self._frame_cond:
+                self._latest_frame = img
+                self._frame_cond.notify()
+    
+    def _read_frame(self):
+        """
+        读取一帧画面，启用采集线程时取采集线程发布的最新帧
+        
+        Returns:
+            image.Image: 画面，暂无画面时返回None
+        """
+        if self._capture_thread is None:
+            return self.cam.read()
+        with self._frame_cond:
+            if self._latest_frame is None:
+                self._frame_cond.wait(timeout=0.1)
+            img, self._latest_frame = self._latest_frame, None
+        return img
     
     def _process_detections(self, img):
         """
@@ -231,53 +417,193 @@ class TouchscreenCameraGUI:
             img: 图像对象
             
         Returns:
-            list: 检测结果
+            tuple: (bboxes, face_bboxes, face_mask) 检测结果数组
         """
-        detections = self.detector.detect_persons(img)
+        # 每帧收取工作进程的识别结果，目标不再待识别时也不会积压在队列中
+        if self.recognizer_worker is not None:
+            self._poll_recognizer_worker()
         
-        if detections:
-            for detection in detections:
-                bbox = detection['bbox']
-                face_bbox = detection.get('face_bbox')
-                x, y, w, h = bbox
-                
-                # 选择框颜色
-                if self.recording['active']:
-                    box_color = image.Color.from_rgb(255, 255, 0)  # 黄色 - 记录中
-                else:
-                    box_color = image.Color.from_rgb(0, 255, 0)    # 绿色 - 正常
+        # 每 det_stride 帧检测一次，其余帧沿用上次的检测框
+        if self._last_detections is None or self.frame_count % self.det_stride == 0:
+            self._last_detections = self.detector.detect_persons_np(img)
+        bboxes, face_bboxes, face_mask = self._last_detections
+        
+        count = len(bboxes)
+        if count:
+            # 收集待识别的人脸（非记录模式）
+            reco_idx = []
+            if not self.recording['active']:
+                reco_idx = np.flatnonzero(face_mask)
+            
+            # 选择框颜色：黄色 - 记录中，绿色 - 正常
+            box_color = (255, 255, 0) if self.recording['active'] else (0, 255, 0)
+            labels = [None] * count
+            label_colors = [box_color] * count
+            
+            # 只对新目标、过期目标和低置信度目标重新识别，其余沿用跟踪缓存
+            if len(reco_idx):
+                track_ids = self._match_tracks(bboxes[reco_idx])
+                pending = [(tid, tuple(face_bboxes[i].tolist())) for tid, i in zip(track_ids, reco_idx)
+                           if self._track_needs_recognition(self._tracks[tid])]
                 
-                # 绘制检测框
-                try:
-                    img.draw_rect(x, y, w, h, color=box_color, thickness=2)
-                    
-                    # 绘制人脸框
-                    if face_bbox:
-                        fx, fy, fw, fh = face_bbox
-                        img.draw_rect(fx, fy, fw, fh, 
-                                    color=image.Color.from_rgb(0, 255, 255), thickness=1)
-                except:
-                    pass
+                if pending:
+                    self._recognize_faces(img, pending)
                 
-                # 识别和标注（非记录模式）
-                if face_bbox and not self.recording['active']:
-                    person_id, confidence, person_name = self.recognizer.recognize_person(img, face_bbox)
-                    
-                    if person_id:
-                        # 已知人物
-                        label = f"{person_name} ({confidence:.2f})"
-                        label_color = image.Color.from_rgb(255, 0, 0)
-                    else:
-                        # 未知人物
-                        label = f"未知 ({confidence:.2f})"
-                        label_color = image.Color.from_rgb(255, 255, 255)
-                    
-                    try:
-                        img.draw_string(x, y - 20, label, color=label_color)
-                    except:
-                        pass
+                for i, tid in zip(reco_idx, track_ids):
+                    track = self._tracks[tid]
+                    if track['last_reco_frame'] is not None:
+                        labels[i] = track['label']
+                        label_colors[i] = track['label_color']
+            else:
+                self._tracks.clear()
+            
+            # 组装本帧所有上半身框和人脸框，统一交给 draw_boxes_labels 绘制
+            face_count = int(np.count_nonzero(face_mask))
+            boxes = np.concatenate((bboxes, face_bboxes[face_mask]))
+            colors = [box_color] * count + [(0, 255, 255)] * face_count
+            thickness = [2] * count + [1] * face_count
+            texts = labels + [None] * face_count
+            text_colors = label_colors + [None] * face_count
+            
+            draw_boxes_labels(img, boxes, texts, colors, thickness, text_colors)
+        else:
+            self._tracks.clear()
+        
+        return bboxes, face_bboxes, face_mask
+    
+    def _match_tracks(self, bboxes):
+        """
+        按IoU将检测框贪心匹配到已有跟踪目标，未匹配的检测新建目标
+        
+        Args:
+            bboxes: (N, 4) 检测框数组
+            
+        Returns:
+            list: 与 bboxes 一一对应的 track_id 列表
+        """
+        unmatched = dict(self._tracks)
+        track_ids = []
+        
+        for bbox in bboxes.tolist():
+            best_id, best_iou = None, self.track_iou_threshold
+            for tid, track in unmatched.items():
+                iou = self.detector.calculate_iou(bbox, track['bbox'])
+                if iou > best_iou:
+                    best_id, best_iou = tid, iou
+            
+            if best_id is None:
+                best_id = self._next_track_id
+                self._next_track_id += 1
+                self._tracks[best_id] = {
+                    'bbox': bbox,
+                    'person_id': None,
+                    'name': None,
+                    'conf': 0.0,
+                    'last_reco_frame': None,
+                    'label': None,
+                    'label_conf': 0.0,
+                    'label_color': None
+                }
+            else:
+                del unmatched[best_id]
+                self._tracks[best_id]['bbox'] = bbox
+            
+            track_ids.append(best_id)
+        
+        # 本帧消失的目标不再保留
+        for tid in unmatched:
+            del self._tracks[tid]
+        
+        return track_ids
+    
+    def _track_needs_recognition(self, track):
+        """
+        判断跟踪目标是否需要重新识别
+        
+        Args:
+            track: 跟踪目标信息
+            
+        Returns:
+            bool: 是否需要识别
+        """
+        if track['last_reco_frame'] is None:
+            return True
+        if track['conf'] < self.reco_min_conf:
+            return True
+        return self.frame_count - track['last_reco_frame'] >= self.reco_interval
+    
+    def _recognize_faces(self, img, pending):
+        """
+        识别人脸并把结果写回对应的跟踪目标
+        启用工作进程时异步提交，结果返回后再更新目标
+        
+        Args:
+            img: 图像对象
+            pending: [(track_id, face_bbox), ...] 待识别列表
+        """
+        if self.recognizer_worker is None:
+            results = self.recognizer.recognize_persons_batch(img, [bbox for _, bbox in pending])
+            self._apply_recognition(pending, results)
+            return
+        
+        if not self.recognizer_worker.is_busy():
+            if self.recognizer_worker.submit(img, [bbox for _, bbox in pending]):
+                self._pending_tracks = pending
+    
+    def _poll_recognizer_worker(self):
+        """
+        收取工作进程的识别结果；工作进程已退出时改为在主进程中识别
+        """
+        results = self.recognizer_worker.poll()
+        if results is not None:
+            self._apply_recognition(self._pending_tracks, results)
+            self._pending_tracks = []
+        elif not self.recognizer_worker.is_alive():
+            print("识别工作进程不可用，改为在主进程中识别")
+            self.recognizer_worker = None
+            self._pending_tracks = []
+    
+    def _apply_recognition(self, pending, results):
+        """
+        将识别结果写入跟踪目标
         
-        return detections
+        Args:
+            pending: [(track_id, face_bbox), ...] 识别请求
+            results: 对应的 (person_id, confidence, person_name) 列表
+        """
+        for (tid, _), (person_id, confidence, person_name) in zip(pending, results):
+            track = self._tracks.get(tid)
+            if track is None:
+                continue
+            
+            # 名字不变且置信度变化很小时沿用已格式化的标签
+            if (track['label'] is None or person_id != track['person_id']
+                    or abs(confidence - track['label_conf']) > 0.01):
+                conf_str = ''.join((' (', format(confidence, '.2f'), ')'))
+                if person_id:
+                    # 已知人物 - 红色
+                    track['label'] = person_name + conf_str
+                    track['label_color'] = (255, 0, 0)
+                else:
+                    # 未知人物 - 白色
+                    track['label'] = '未知' + conf_str
+                    track['label_color'] = (255, 255, 255)
+                track['label_conf'] = confidence
+            
+            track['person_id'] = person_id
+            track['conf'] = confidence
+            track['name'] = person_name
+            track['last_reco_frame'] = self.frame_count
+    
+    def _notify_recognizer_changed(self):
+        """
+        人物数据变化后清空跟踪缓存，并通知识别工作进程重新加载
+        """
+        self._tracks.clear()
+        self._pending_tracks = []
+        self._ui_last_ns = 0
+        if self.recognizer_worker is not None:
+            self.recognizer_worker.reload()
     
     def _check_touch_input(self):
         """
@@ -286,12 +612,17 @@ class TouchscreenCameraGUI:
         Returns:
             str: 触摸的按键名称，如果没有则返回None
         """
-        current_time = time.time()
+        current_time = time.monotonic()
         
         # 触摸冷却检查
         if current_time - self.touch_state['last_touch_time'] < self.touch_state['touch_cooldown']:
             return None
         
+        # 限制触摸屏读取频率，点击持续时间远大于轮询间隔，不会漏掉
+        if current_time - self._last_touch_poll < self.touch_poll_interval:
+            return None
+        self._last_touch_poll = current_time
+        
         touch_x, touch_y = None, None
         
         if self.has_touchscreen:
@@ -306,7 +637,7 @@ class TouchscreenCameraGUI:
                     elif isinstance(touch_point, (list, tuple)) and len(touch_point) >= 2:
                         touch_x, touch_y = touch_point[0], touch_point[1]
             except Exception as e:
-                print(f"触摸屏读取错误: {e}")
+                self._log_error(f"触摸屏读取错误: {e}")
         
         elif self.demo_mode:
             # 演示模式 - 模拟触摸
@@ -314,16 +645,31 @@ class TouchscreenCameraGUI:
         
         # 检查触摸是否在按键区域内
         if touch_x is not None and touch_y is not None:
-            for button_name, button in self.buttons.items():
-                if (button['enabled'] and 
-                    button['x'] <= touch_x <= button['x'] + button['w'] and
-                    button['y'] <= touch_y <= button['y'] + button['h']):
-                    
-                    self.touch_state['last_touch_time'] = current_time
-                    return button_name
+            button_name = self._hit_test_buttons(touch_x, touch_y)
+            if button_name is not None:
+                self.touch_state['last_touch_time'] = current_time
+                return button_name
         
         return None
     
+    def _hit_test_buttons(self, touch_x, touch_y):
+        """
+        查找触摸点所在的可用按键
+        
+        Args:
+            touch_x, touch_y: 触摸坐标
+            
+        Returns:
+            str: 按键名称，如果没有命中则返回None
+        """
+        mask = ((self._btn_xs <= touch_x) & (touch_x <= self._btn_x2s) &
+                (self._btn_ys <= touch_y) & (touch_y <= self._btn_y2s))
+        for idx in np.flatnonzero(mask):
+            button_name = self._btn_ids[idx]
+            if self.buttons[button_name]['enabled']:
+                return button_name
+        return None
+    
     def _simulate_touch(self, current_time):
         """
         模拟触摸输入（演示模式）
@@ -344,26 +690,26 @@ class TouchscreenCameraGUI:
         
         elif 0.6 <= cycle_position <= 0.65:
             # 模拟点击清除按键（仅当有记录时）
-            if self.recognizer.get_registered_persons():
+            if self.recognizer.registered_persons:
                 button = self.buttons['clear']
                 return button['x'] + button['w']//2, button['y'] + button['h']//2
         
         return None, None
     
-    def _handle_button_press(self, button_name, detections):
+    def _handle_button_press(self, button_name, has_detection):
         """
         处理按键点击
         
         Args:
             button_name: 按键名称
-            detections: 当前检测结果
+            has_detection: 当前帧是否检测到人物
         """
-        current_time = time.time()
+        current_time = time.monotonic()
         
         if button_name == 'record':
             if not self.recording['active']:
                 # 开始记录
-                if detections:
+                if has_detection:
                     # 检查是否还有空位
                     status = self.recognizer.get_status_info()
                     if status['available_slots'] > 0:
@@ -402,7 +748,7 @@ class TouchscreenCameraGUI:
         """
         更新按键状态
         """
-        current_time = time.time()
+        current_time = time.monotonic()
         
         for button_name, button in self.buttons.items():
             # 检查按键释放
@@ -417,29 +763,33 @@ class TouchscreenCameraGUI:
                 button['enabled'] = True
                 if self.recording['active']:
                     button['text'] = '取消'
-                    button['color_normal'] = image.Color.from_rgb(150, 100, 0)
+                    button['color_normal'] = _COLORS['cancel']
                 else:
                     button['text'] = '记录'
-                    button['color_normal'] = image.Color.from_rgb(0, 150, 0)
+                    button['color_normal'] = _COLORS['record']
             
             elif button_name == 'clear':
                 # 清除按键只在有记录时可用
-                has_records = len(self.recognizer.get_registered_persons()) > 0
+                has_records = len(self.recognizer.registered_persons) > 0
                 button['enabled'] = has_records
     
     def _start_recording(self):
         """
         开始记录新人物
         """
-        person_count = len(self.recognizer.get_registered_persons())
+        person_count = len(self.recognizer.registered_persons)
         
         self.recording.update({
             'active': True,
             'name': f"人物{person_count + 1}",
             'samples': 0,
             'person_id': None,
-            'last_sample_time': time.time()
+            'last_sample_time': time.monotonic()
         })
+        
+        # 模式切换后下一帧重新检测并刷新界面文字
+        self._last_detections = None
+        self._ui_last_ns = 0
     
     def _cancel_recording(self):
         """
@@ -448,6 +798,7 @@ class TouchscreenCameraGUI:
         # 如果已经开始记录，删除部分数据
         if self.recording['person_id']:
             self.recognizer.delete_person(self.recording['person_id'])
+            self._notify_recognizer_changed()
         
         self.recording.update({
             'active': False,
@@ -455,29 +806,31 @@ class TouchscreenCameraGUI:
             'samples': 0,
             'person_id': None
         })
+        self._last_detections = None
+        self._ui_last_ns = 0
     
-    def _process_recording(self, img, detections):
+    def _process_recording(self, img, face_bboxes, face_mask):
         """
         处理记录过程
         
         Args:
             img: 当前图像
-            detections: 检测结果
+            face_bboxes: (N, 4) 人脸边界框数组
+            face_mask: (N,) 是否有人脸框
         """
-        if not self.recording['active'] or not detections:
+        if not self.recording['active'] or not len(face_mask):
             return
         
-        current_time = time.time()
+        current_time = time.monotonic()
         
         # 控制采样频率
         if current_time - self.recording['last_sample_time'] < self.recording['auto_sample_interval']:
             return
         
         # 使用第一个检测结果
-        detection = detections[0]
-        face_bbox = detection.get('face_bbox')
-        
-        if face_bbox:
+        if face_mask[0]:
+            face_bbox = tuple(face_bboxes[0].tolist())
+            
             if self.recording['samples'] == 0:
                 # 第一次记录
                 success, person_id, message = self.recognizer.register_person(
@@ -488,6 +841,7 @@ class TouchscreenCameraGUI:
                     print(f"✓ {message}")
                     self.recording['person_id'] = person_id
                     self.recording['samples'] = 1
+                    self._ui_last_ns = 0
                     self.recording['last_sample_time'] = current_time
                 else:
                     print(f"✗ {message}")
@@ -502,12 +856,14 @@ class TouchscreenCameraGUI:
                 if success:
                     print(f"✓ {message}")
                     self.recording['samples'] += 1
+                    self._ui_last_ns = 0
                     self.recording['last_sample_time'] = current_time
                     
                     # 检查是否完成
                     if self.recording['samples'] >= self.recording['max_samples']:
                         print(f"✓ 记录完成: {self.recording['name']}")
                         self.recording['active'] = False
+                        self._notify_recognizer_changed()
                         self._show_system_info()
                 else:
                     print(f"✗ {message}")
@@ -532,19 +888,48 @@ class TouchscreenCameraGUI:
                 print(f"✗ 删除失败: {message}")
         
         print("所有记录已清除")
+        self._notify_recognizer_changed()
         self._show_system_info()
     
     def _update_fps(self):
         """
         更新FPS计算
         """
-        self.fps_counter += 1
-        current_time = time.time()
+        now = time.monotonic_ns()
+        
+        if self._last_frame_ns is not None:
+            dt = now - self._last_frame_ns
+            if self._frame_ns_ema == 0:
+                self._frame_ns_ema = dt
+            else:
+                self._frame_ns_ema += (dt - self._frame_ns_ema) >> 3
+        self._last_frame_ns = now
+        
+        if now - self._fps_publish_ns >= 500_000_000:
+            self._fps_publish_ns = now
+            if self._frame_ns_ema > 0:
+                fps = 1e9 / self._frame_ns_ema
+                if round(fps, 1) != round(self.current_fps, 1):
+                    self._fps_text = "FPS: " + format(fps, '.1f')
+                self.current_fps = fps
+    
+    def _wait_until(self, deadline, has_detection):
+        """
+        等待到帧截止时间，期间以短间隔轮询触摸，按键按下后立即处理
         
-        if current_time - self.fps_start_time >= 1.0:
-            self.current_fps = self.fps_counter / (current_time - self.fps_start_time)
-            self.fps_counter = 0
-            self.fps_start_time = current_time
+        Args:
+            deadline: 截止时间（time.monotonic）
+            has_detection: 当前帧是否检测到人物
+        """
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(self.touch_poll_interval, remaining))
+            
+            touched_button = self._check_touch_input()
+            if touched_button:
+                self._handle_button_press(touched_button, has_detection)
     
     def run(self):
         """
@@ -562,42 +947,68 @@ class TouchscreenCameraGUI:
         print("按 Ctrl+C 退出程序")
         print()
         
+        # 初始化产生的对象（模型、颜色表、叠加层等）整体移出垃圾回收跟踪，
+        # 帧循环中的分代回收不再反复遍历它们
+        gc.collect()
+        gc.freeze()
+        
+        if self.use_capture_thread:
+            self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+            self._capture_thread.start()
+        
+        # 帧循环中反复调用的方法先取到局部变量，省去每帧的属性查找
+        need_exit = app.need_exit
+        monotonic = time.monotonic
+        read_frame = self._read_frame
+        process_detections = self._process_detections
+        update_button_states = self._update_button_states
+        check_touch_input = self._check_touch_input
+        draw_ui_info = self._draw_ui_info
+        draw_virtual_buttons = self._draw_virtual_buttons
+        show = self.disp.show
+        update_fps = self._update_fps
+        wait_until = self._wait_until
+        recording = self.recording
+        frame_period = self.frame_period
+        
         try:
-            while not app.need_exit():
+            while not need_exit():
+                next_deadline = monotonic() + frame_period
+                
                 # 读取摄像头
-                img = self.cam.read()
+                img = read_frame()
                 if img is None:
                     continue
                 
                 self.frame_count += 1
                 
                 # 处理人脸检测
-                detections = self._process_detections(img)
+                bboxes, face_bboxes, face_mask = process_detections(img)
                 
                 # 更新按键状态
-                self._update_button_states()
+                update_button_states()
                 
                 # 检查触摸输入
-                touched_button = self._check_touch_input()
+                touched_button = check_touch_input()
                 if touched_button:
-                    self._handle_button_press(touched_button, detections)
+                    self._handle_button_press(touched_button, len(bboxes) > 0)
                 
                 # 处理记录过程
-                if self.recording['active']:
-                    self._process_recording(img, detections)
+                if recording['active']:
+                    self._process_recording(img, face_bboxes, face_mask)
                 
                 # 绘制界面元素
-                self._draw_ui_info(img)
-                self._draw_virtual_buttons(img)
+                draw_ui_info(img)
+                draw_virtual_buttons(img)
                 
                 # 显示画面
-                self.disp.show(img)
+                show(img)
                 
                 # 更新FPS
-                self._update_fps()
+                update_fps()
                 
-                # 控制帧率
-                time.sleep_ms(33)  # 约30FPS
+                # 控制帧率：等待到本帧截止时间，期间继续响应触摸
+                wait_until(next_deadline, len(bboxes) > 0)
         
         except KeyboardInterrupt:
             print("\n程序被用户中断")
@@ -607,7 +1018,13 @@ class TouchscreenCameraGUI:
             traceback.print_exc()
         finally:
             print("清理资源...")
+            self._stop_evt.set()
+            if self._capture_thread is not None:
+                self._capture_thread.join(timeout=1.0)
+                self._capture_thread = None
             self.cam.close()
+            if self.recognizer_worker is not None:
+                self.recognizer_worker.stop()
             if self.touch:
                 try:
                     self.touch.close()
@@ -623,7 +1040,8 @@ def main():
     print("支持屏幕虚拟按键操作")
     
     # 创建并运行GUI
-    gui = TouchscreenCameraGUI()
+    gui = TouchscreenCameraGUI(use_recognizer_worker='--worker' in sys.argv,
+                               use_capture_thread='--capture-thread' in sys.argv)
     gui.run()
 
 if __name__ == "__main__":
@@ -8,6 +8,7 @@
 import sys
 import os
 import time
+import random
 from maix import camera, display, app, image
 
 # 添加项目根目录到路径
@@ -90,7 +91,6 @@ except ImportError:
                 
             def detect_persons(self, img):
                 # 模拟检测结果
-                import random
                 if random.random() > 0.3:  # 70%概率检测到人脸
                     return [{
                         'bbox': (100, 100, 80, 120),
@@ -9,6 +9,8 @@ MaixPy 视觉识别云台系统 - 主程序
 import sys
 import os
 import time
+import asyncio
+import traceback
 
 # 可选的MaixPy模块（显示与退出标志）
 try:
@@ -19,6 +21,18 @@ try:
     from maix import app as _maix_app
 except Exception:
     _maix_app = None
+try:
+    from maix import image as _maix_image
+    _LABEL_COLOR = _maix_image.Color.from_rgb(255, 0, 0)
+except Exception:
+    _LABEL_COLOR = None
+
+
+# 主循环目标帧周期（秒）
+FRAME_PERIOD = 1.0 / 30
+
+# 检测输入缩小倍数：在缩小图上检测，显示和识别仍使用原图
+DETECT_SCALE = 2
 
 
 # 路径设置：确保能导入 src 包（兼容 /tmp/maixpy_run 等环境）
@@ -30,10 +44,16 @@ candidate_roots = [
     "/flash",
     "/sdcard",
 ]
+# 设置了 VISION_ROOT 时直接使用，省去逐个目录的 stat 调用
+_env_root = os.environ.get("VISION_ROOT")
+if _env_root and os.path.isdir(os.path.join(_env_root, "src")):
+    candidate_roots = [_env_root]
 for base in candidate_roots:
     try:
-        if os.path.isdir(os.path.join(base, "src")) and base not in sys.path:
-            sys.path.insert(0, base)
+        if os.path.isdir(os.path.join(base, "src")):
+            # 找到第一个包含 src 的目录即停止，已在 sys.path 中的不重复插入
+            if base not in sys.path:
+                sys.path.insert(0, base)
             break
     except Exception:
         pass
@@ -52,13 +72,20 @@ except Exception:
         raise
 
     class CameraController:
-        def __init__(self, width=512, height=320):
+        def __init__(self, width=512, height=320, buffer_size=None):
             self.width = width
             self.height = height
+            self.buffer_size = buffer_size
             self.camera = None
 
         def initialize_camera(self):
             try:
+                if self.buffer_size:
+                    try:
+                        self.camera = _maix_camera.Camera(self.width, self.height, buff_num=self.buffer_size)
+                        return True
+                    except TypeError:
+                        pass
                 self.camera = _maix_camera.Camera(self.width, self.height)
                 return True
             except Exception:
@@ -75,6 +102,20 @@ except Exception:
             except Exception:
                 return None
 
+        def capture_latest(self, max_drain=4):
+            img = self.capture_image()
+            if img is None:
+                return None
+            for _ in range(max_drain):
+                try:
+                    newer = self.camera.read(block=False)
+                except Exception:
+                    break
+                if newer is None:
+                    break
+                img = newer
+            return img
+
         def release_camera(self):
             try:
                 if self.camera is not None and hasattr(self.camera, "close"):
@@ -100,13 +141,21 @@ class MaixVisionSystem:
         print("=== MaixPy Vision Tracking System ===")
         print("Initializing system...")
 
-        self.camera = CameraController(width=512, height=320)
+        # 只保留1帧驱动缓冲，避免处理积压的旧帧
+        self.camera = CameraController(width=512, height=320, buffer_size=1)
         self.detector = None
         self.recognizer = None
         self.gimbal = None
         self.running = False
         self.disp = None
 
+        # 流水线：采集任务 -> 处理任务 -> 显示任务，在 _run 中创建
+        self._cap_q = None
+        self._disp_q = None
+        self._stop_evt = None
+        self._err_log_last = 0.0
+        self._err_seen = {}  # 异常类型+信息前缀 -> 出现次数
+
     def initialize_modules(self):
         try:
             print("📷 Initializing camera...")
@@ -116,11 +165,7 @@ class MaixVisionSystem:
                 return False
             print("✅ Camera ok")
 
-            print("🔍 Initializing detector...")
-            # TODO: 初始化人脸检测模块
-
-            print("🧠 Initializing recognizer...")
-            # TODO: 初始化人脸识别模块
+            # 检测/识别模块加载模型较慢且占内存，首次使用时再导入（见 _get_detector/_get_recognizer）
 
             print("🎮 Initializing gimbal...")
             # TODO: 初始化云台模块
@@ -155,24 +200,137 @@ class MaixVisionSystem:
             self.cleanup()
 
     def main_loop(self):
+        asyncio.run(self._run())
+
+    async def _run(self):
+        # 采集队列最多积压2帧，耗时调用放到线程池中执行
+        self._cap_q = asyncio.Queue(maxsize=2)
+        # 显示队列只留一帧：显示慢于处理时只显示最新结果，不拖慢处理
+        self._disp_q = asyncio.Queue(maxsize=1)
+        self._stop_evt = asyncio.Event()
+
+        tasks = [
+            asyncio.create_task(self._capture_task()),
+            asyncio.create_task(self._process_task()),
+        ]
+        try:
+            await self._display_task()
+        finally:
+            self._stop_evt.set()
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _capture_task(self):
+        while not self._stop_evt.is_set():
+            next_deadline = time.monotonic() + FRAME_PERIOD
+
+            img = await asyncio.to_thread(self.camera.capture_latest)
+            if img is not None:
+                self._put_latest(self._cap_q, img)
+
+            # 睡到本帧截止时间，采集超时则直接进入下一帧
+            remaining = next_deadline - time.monotonic()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+
+    async def _process_task(self):
+        while not self._stop_evt.is_set():
+            img = await self._cap_q.get()
+            try:
+                img = await asyncio.to_thread(self._process_frame, img)
+            except Exception as e:
+                self._log_error(f"❌ Process error: {e}", e)
+                continue
+
+            self._put_latest(self._disp_q, img)
+
+    async def _display_task(self):
         while self.running and (_maix_app is None or not _maix_app.need_exit()):
-            img = self.camera.capture_image()
-            if img is None:
+            try:
+                img = await asyncio.wait_for(self._disp_q.get(), timeout=0.1)
+            except asyncio.TimeoutError:
                 continue
 
-            # 显示画面
-            if self.disp is not None:
-                try:
-                    self.disp.show(img)
-                except Exception:
-                    pass
+            # TODO: 触摸UI等
 
-            # TODO: 检测/识别/云台/触摸UI等
+            # 显示画面
+            if self.disp is None:
+                continue
+            try:
+                self.disp.show(img)
+            except Exception as e:
+                self._log_error(f"❌ Display error: {e}", e)
 
-            time.sleep(0.01)
+    def _get_detector(self):
+        if self.detector is None:
+            print("🔍 Initializing detector...")
+            from src.vision.detection.person_detector import PersonDetector
+            width, height = self.camera.get_resolution()
+            self.detector = PersonDetector(camera_width=width, camera_height=height,
+                                           detect_scale=DETECT_SCALE)
+        return self.detector
+
+    def _get_recognizer(self):
+        if self.recognizer is None:
+            print("🧠 Initializing recognizer...")
+            from src.vision.recognition.face_recognition import PersonRecognizer
+            self.recognizer = PersonRecognizer()
+        return self.recognizer
+
+    def _process_frame(self, img):
+        detector = self._get_detector()
+        detections = detector.detect_persons(img)
+        if not detections:
+            return img
+        img = detector.draw_green_boxes(img, detections)
+
+        # 带人脸框的检测批量识别一次，已注册人物在框上方标注姓名
+        results = self._get_recognizer().recognize_detections(img, detections)
+        for detection, result in zip(detections, results):
+            if result is None or result[0] is None or _LABEL_COLOR is None:
+                continue
+            _, confidence, person_name = result
+            x, y, _, _ = detection['bbox']
+            try:
+                img.draw_string(x, max(0, y - 20), f"{person_name} ({confidence:.2f})", color=_LABEL_COLOR)
+            except Exception:
+                pass
+
+        # TODO: 云台
+        return img
+
+    def _log_error(self, message, exc=None):
+        # 同一种异常只在第一次打印完整堆栈，之后只计数；错误信息每秒最多打印一次
+        if exc is not None:
+            key = type(exc).__name__ + str(exc)[:32]
+            count = self._err_seen.get(key, 0) + 1
+            self._err_seen[key] = count
+            if count == 1:
+                traceback.print_exception(type(exc), exc, exc.__traceback__)
+                self._err_log_last = time.monotonic()
+                return
+            message = f"{message} (x{count})"
+        now = time.monotonic()
+        if now - self._err_log_last >= 1.0:
+            print(message)
+            self._err_log_last = now
+
+    @staticmethod
+    def _put_latest(q, item):
+        # 下游来不及处理时丢弃最旧的帧，始终保留最新画面
+        try:
+            q.put_nowait(item)
+        except asyncio.QueueFull:
+            try:
+                q.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            q.put_nowait(item)
 
     def cleanup(self):
         print("🧹 Cleaning up...")
+        self.running = False
         try:
             if self.camera:
                 self.camera.release_camera()
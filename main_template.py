@@ -168,9 +168,11 @@ class MaixVisionSystem:
         主循环 - 这是系统的核心
         """
         
+        # camera.read() 会阻塞到新帧就绪，由摄像头驱动控制节奏，无需额外限速
         while self.running:
             img = self.camera.capture_image()
             if img is None:
+                time.sleep(0.001)  # 暂无画面时短暂让出CPU
                 continue  # 本帧跳过
             # 显示画面（如显示可用）
             if self.disp is not None:
@@ -183,7 +185,6 @@ class MaixVisionSystem:
             # TODO: 更新显示
             # TODO: 处理用户输入
             # TODO: 控制云台
-            time.sleep(0.01)  # 轻微限速
             
             
     
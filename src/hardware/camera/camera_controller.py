@@ -12,16 +12,19 @@ class CameraController:
     摄像头控制器类
     """
     
-    def __init__(self, width=512, height=320):
+    def __init__(self, width=512, height=320, buffer_size=None):
         """
         初始化摄像头控制器
         
         Args:
             width: 图像宽度
             height: 图像高度
+            buffer_size: 驱动帧缓冲数量，None 表示使用默认值；
+                设为1可避免处理积压的旧帧
         """
         self.width = width
         self.height = height
+        self.buffer_size = buffer_size
         self.camera = None
     
     def initialize_camera(self):
@@ -33,6 +36,13 @@ class CameraController:
         """
         try:
             # 使用初始化时设置的分辨率
+            if self.buffer_size:
+                try:
+                    self.camera = camera.Camera(self.width, self.height, buff_num=self.buffer_size)
+                    return True
+                except TypeError:
+                    # 旧版本不支持 buff_num 参数
+                    pass
             self.camera = camera.Camera(self.width, self.height)
             return True
         except Exception:
@@ -56,6 +66,31 @@ class CameraController:
         except Exception:
             return None
     
+    def capture_latest(self, max_drain=4):
+        """
+        采集最新图像，丢弃驱动缓冲中已积压的旧帧
+        
+        Args:
+            max_drain: 最多额外读取的帧数
+            
+        Returns:
+            image: 采集到的最新图像
+        """
+        img = self.capture_image()
+        if img is None:
+            return None
+        
+        for _ in range(max_drain):
+            try:
+                newer = self.camera.read(block=False)
+            except Exception:
+                # 不支持非阻塞读取时直接返回
+                break
+            if newer is None:
+                break
+            img = newer
+        return img
+    
     def release_camera(self):
         """
         释放摄像头资源
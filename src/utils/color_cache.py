@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+颜色缓存工具模块
+按 (r, g, b) 缓存 image.Color 对象，绘制时相同颜色不再重复创建
+"""
+
+try:
+    from maix import image
+except ImportError:
+    image = None
+
+# (r, g, b) -> image.Color 缓存
+_color_cache = {}
+
+
+def get_color(rgb):
+    """
+    获取（缓存的）颜色对象
+
+    Args:
+        rgb: (r, g, b) 颜色值
+
+    Returns:
+        image.Color: 颜色对象
+    """
+    key = (int(rgb[0]), int(rgb[1]), int(rgb[2]))
+    color = _color_cache.get(key)
+    if color is None:
+        color = image.Color.from_rgb(*key)
+        _color_cache[key] = color
+    return color
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+叠加绘制工具模块
+绘制一帧内的所有检测框和标签
+MaixPy 没有批量绘制接口，仍是每个框调用一次 draw_rect；
+这里省去的是每个框重复创建 Color 和重复渲染文字：
+颜色对象缓存复用，标签文字渲染成贴图后缓存，重复出现的文字直接贴图
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    from maix import image
+except ImportError:
+    image = None
+
+from .color_cache import get_color
+
+# (文字, 颜色, 缩放) -> 预先渲染的文字贴图，最近最少使用淘汰
+_TEXT_CACHE_SIZE = 32
+_text_cache = OrderedDict()
+
+# 异常类型+信息前缀 -> 出现次数，同一种绘制错误只打印第一次
+_err_seen = {}
+
+
+def _log_error(message, exc):
+    """
+    打印绘制错误，同一种异常只打印第一次，避免持续出错时每帧刷屏
+
+    Args:
+        message: 错误信息
+        exc: 异常对象
+    """
+    key = type(exc).__name__ + str(exc)[:32]
+    count = _err_seen.get(key, 0) + 1
+    _err_seen[key] = count
+    if count == 1:
+        print(message)
+
+
+def _render_text_tile(text, rgb, scale):
+    """
+    将文字渲染为透明背景的贴图
+
+    Args:
+        text: 文字
+        rgb: (r, g, b) 颜色值
+        scale: 字体缩放
+
+    Returns:
+        image.Image: 文字贴图，无法计算文字尺寸时返回 None
+    """
+    try:
+        size = image.string_size(text, scale=scale)
+        tile = image.Image(size.width(), size.height(), image.Format.FMT_RGBA8888)
+    except Exception:
+        return None
+    tile.draw_rect(0, 0, size.width(), size.height(),
+                   color=image.Color.from_rgba(0, 0, 0, 0), thickness=-1)
+    tile.draw_string(0, 0, text, color=get_color(rgb), scale=scale)
+    return tile
+
+
+def draw_text_cached(img, x, y, text, rgb, scale=1):
+    """
+    绘制文字，相同文字只渲染一次，之后直接贴图
+
+    Args:
+        img: 图像对象
+        x, y: 文字左上角坐标
+        text: 文字
+        rgb: (r, g, b) 颜色值
+        scale: 字体缩放
+    """
+    key = (text, tuple(rgb), scale)
+    tile = _text_cache.get(key)
+    if tile is None:
+        tile = _render_text_tile(text, rgb, scale)
+        if tile is None:
+            # 不支持贴图时直接绘制文字
+            img.draw_string(x, y, text, color=get_color(rgb), scale=scale)
+            return
+        _text_cache[key] = tile
+        if len(_text_cache) > _TEXT_CACHE_SIZE:
+            _text_cache.popitem(last=False)
+    else:
+        _text_cache.move_to_end(key)
+    img.draw_image(x, y, tile)
+
+
+def draw_boxes_labels(img, boxes, labels=None, colors=None, thickness=2,
+                      label_colors=None, label_offset=20):
+    """
+    逐框绘制检测框和标签，颜色对象和标签贴图复用缓存
+
+    Args:
+        img: 图像对象
+        boxes: N×4 的 (x, y, w, h) 数组或列表
+        labels: 长度为N的标签列表，None 表示该框不绘制标签
+        colors: N×3 的 RGB 数组或列表，默认绿色
+        thickness: 线宽，整数或长度为N的列表
+        label_colors: 标签颜色（N×3），默认与框颜色相同
+        label_offset: 标签相对框顶部的上移距离
+
+    Returns:
+        img: 绘制后的图像
+    """
+    if image is None or boxes is None or len(boxes) == 0:
+        return img
+
+    count = len(boxes)
+    if colors is None:
+        colors = [(0, 255, 0)] * count
+    if isinstance(thickness, int):
+        thickness = [thickness] * count
+    if label_colors is None:
+        label_colors = colors
+
+    # 一次性算出所有框坐标和标签位置
+    boxes = np.asarray(boxes, dtype=np.int32).reshape(-1, 4)
+    label_ys = np.maximum(boxes[:, 1] - label_offset, 0).tolist()
+    boxes = boxes.tolist()
+
+    for i in range(count):
+        x, y, w, h = boxes[i]
+        # 单个框绘制失败不影响其余框
+        try:
+            img.draw_rect(x, y, w, h, color=get_color(colors[i]), thickness=int(thickness[i]))
+
+            if labels is not None and labels[i]:
+                draw_text_cached(img, x, label_ys[i], labels[i], label_colors[i])
+        except Exception as e:
+            _log_error(f"叠加绘制错误: {e}", e)
+
+    return img
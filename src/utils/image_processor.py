@@ -3,8 +3,17 @@
 """
 图像处理工具模块
 提供通用的图像处理功能
+所有操作直接调用 MaixPy 图像接口，像素数据始终留在 C 侧，不经过 Python 复制
 """
 
+try:
+    from maix import image as maix_image
+except ImportError:
+    maix_image = None
+
+from .color_cache import get_color
+
+
 class ImageProcessor:
     """
     图像处理器类
@@ -29,8 +38,10 @@ class ImageProcessor:
         Returns:
             image: 调整后的图像
         """
-        # TODO: 实现图像大小调整
-        pass
+        # 尺寸相同时直接返回原图，不再复制
+        if image.width() == width and image.height() == height:
+            return image
+        return image.resize(width, height)
     
     def crop_image(self, image, x, y, w, h):
         """
@@ -44,8 +55,7 @@ class ImageProcessor:
         Returns:
             image: 裁剪后的图像
         """
-        # TODO: 实现图像裁剪
-        pass
+        return image.crop(x, y, w, h)
     
     def enhance_image(self, image):
         """
@@ -71,8 +81,12 @@ class ImageProcessor:
         Returns:
             bool: 保存是否成功
         """
-        # TODO: 保存图像到文件
-        pass
+        try:
+            image.save(filepath)
+            return True
+        except Exception as e:
+            print(f"保存图像失败: {e}")
+            return False
     
     def load_image(self, filepath):
         """
@@ -84,8 +98,11 @@ class ImageProcessor:
         Returns:
             image: 加载的图像
         """
-        # TODO: 从文件加载图像
-        pass
+        try:
+            return maix_image.load(filepath)
+        except Exception as e:
+            print(f"加载图像失败: {e}")
+            return None
     
     def draw_rectangle(self, image, x, y, w, h, color=(0, 255, 0), thickness=2):
         """
@@ -101,8 +118,8 @@ class ImageProcessor:
         Returns:
             image: 绘制后的图像
         """
-        # TODO: 绘制矩形框
-        pass
+        image.draw_rect(x, y, w, h, color=get_color(color), thickness=thickness)
+        return image
     
     def draw_text(self, image, text, x, y, color=(255, 255, 255), size=1):
         """
@@ -118,5 +135,5 @@ class ImageProcessor:
         Returns:
             image: 绘制后的图像
         """
-        # TODO: 绘制文本
-        pass
+        image.draw_string(x, y, text, color=get_color(color), scale=size)
+        return image
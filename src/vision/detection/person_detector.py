@@ -8,6 +8,99 @@
 
 from maix import nn, image
 import math
+import os
+import numpy as np
+
+# 绘制颜色，模块加载时创建一次
+_GREEN = image.Color.from_rgb(0, 255, 0)
+_CYAN = image.Color.from_rgb(0, 255, 255)
+
+# 可选：numba 可用时对 NMS 循环做 JIT 编译
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+
+def _nms_keep(boxes, order, overlap_threshold):
+    """
+    按置信度顺序做非极大值抑制
+    
+    Args:
+        boxes: (N, 4) float32 的 (x, y, w, h) 边界框
+        order: 按置信度从高到低排列的下标
+        overlap_threshold: 重叠阈值
+        
+    Returns:
+        np.ndarray: 保留的下标（按置信度顺序）
+    """
+    keep = np.empty(order.shape[0], dtype=np.int64)
+    count = 0
+    for i in range(order.shape[0]):
+        a = order[i]
+        ax1, ay1 = boxes[a, 0], boxes[a, 1]
+        ax2, ay2 = ax1 + boxes[a, 2], ay1 + boxes[a, 3]
+        area_a = boxes[a, 2] * boxes[a, 3]
+        
+        overlapped = False
+        for j in range(count):
+            b = keep[j]
+            bx1, by1 = boxes[b, 0], boxes[b, 1]
+            bx2, by2 = bx1 + boxes[b, 2], by1 + boxes[b, 3]
+            
+            inter_w = min(ax2, bx2) - max(ax1, bx1)
+            inter_h = min(ay2, by2) - max(ay1, by1)
+            if inter_w <= 0 or inter_h <= 0:
+                continue
+            
+            inter = inter_w * inter_h
+            union = area_a + boxes[b, 2] * boxes[b, 3] - inter
+            if union > 0 and inter / union > overlap_threshold:
+                overlapped = True
+                break
+        
+        if not overlapped:
+            keep[count] = a
+            count += 1
+    
+    return keep[:count]
+
+
+if _HAS_NUMBA:
+    _nms_keep = njit(cache=True, fastmath=True)(_nms_keep)
+
+
+# 不同固件版本的绘制接口，按优先级排列，初始化时探测一次可用的实现
+_RECT_DRAWERS = (
+    lambda img, x, y, w, h, color, thickness: img.draw_rect(x, y, w, h, color=color, thickness=thickness),
+    lambda img, x, y, w, h, color, thickness: img.draw_rectangle(x, y, x+w, y+h, color=color, thickness=thickness),
+    lambda img, x, y, w, h, color, thickness: img.draw_rect(x, y, x+w, y+h, color),
+)
+_TEXT_DRAWERS = (
+    lambda img, x, y, text, color: img.draw_string(x, y, text, color=color),
+    lambda img, x, y, text, color: img.draw_text(x, y, text, color=color),
+)
+
+
+def _probe_drawer(drawers, *args):
+    """
+    在测试图像上依次尝试绘制接口，返回第一个可用的实现
+    
+    Args:
+        drawers: 候选绘制函数
+        *args: 测试调用参数（第一个为测试图像）
+        
+    Returns:
+        callable: 可用的绘制函数，都不可用时返回 None
+    """
+    for drawer in drawers:
+        try:
+            drawer(*args)
+            return drawer
+        except Exception:
+            continue
+    return None
 
 class PersonDetector:
     """
@@ -15,13 +108,16 @@ class PersonDetector:
     专门用于检测5x5cm人物照片(距离50cm+)
     """
     
-    def __init__(self, camera_width=512, camera_height=320):
+    def __init__(self, camera_width=512, camera_height=320, detect_scale=None):
         """
         初始化人物检测器
         
         Args:
             camera_width: 摄像头宽度(像素)
             camera_height: 摄像头高度(像素)
+            detect_scale: 检测缩小倍数，2表示在长宽各一半的图像上检测；
+                未指定时读取环境变量 MODE_DET_SCALE（检测图与原图的比例，
+                取值 (0, 1]，如 0.5），都没有时不缩小
         """
         print("初始化真实人物上半身检测器...")
         
@@ -29,11 +125,33 @@ class PersonDetector:
         self.camera_width = camera_width
         self.camera_height = camera_height
         
+        # 在缩小图上检测，结果坐标换算回原图
+        if detect_scale is None:
+            detect_scale = 1
+            env_scale = os.environ.get('MODE_DET_SCALE')
+            if env_scale:
+                try:
+                    fraction = float(env_scale)
+                except ValueError:
+                    fraction = 0.0
+                if 0.0 < fraction <= 1.0:
+                    detect_scale = 1.0 / fraction
+                else:
+                    print(f"× 无效的 MODE_DET_SCALE: {env_scale}，应为 (0, 1] 范围内的比例")
+        self.detect_scale = max(1.0, float(detect_scale))
+        
         # 初始化人脸检测器（专门用于真实人物）
         try:
             self.face_detector = nn.FaceDetector(model="/root/models/face_detector.mud")
             self.has_face_detector = True
             print("✓ 人脸检测器初始化成功")
+            
+            # 用空白图先推理一次，让模型加载到NPU并分配好缓冲，避免首帧卡顿
+            try:
+                self.face_detector.detect(image.Image(self.face_detector.input_width(),
+                                                      self.face_detector.input_height()))
+            except Exception:
+                pass
         except Exception as e:
             print(f"× 人脸检测器初始化失败: {e}")
             self.has_face_detector = False
@@ -54,6 +172,18 @@ class PersonDetector:
         self.torso_ratio_min = 1.2  # 上半身最小长宽比(高/宽)
         self.torso_ratio_max = 2.5  # 上半身最大长宽比
         
+        # 探测当前固件可用的绘制接口
+        try:
+            probe_img = image.Image(8, 8)
+        except Exception:
+            probe_img = None
+        self._draw_rect_fn = _probe_drawer(_RECT_DRAWERS, probe_img, 0, 0, 2, 2, _GREEN, 1)
+        self._draw_text_fn = _probe_drawer(_TEXT_DRAWERS, probe_img, 0, 0, "", _GREEN)
+        
+        # 预先触发一次 JIT 编译，避免首帧卡顿
+        if _HAS_NUMBA:
+            _nms_keep(np.zeros((1, 4), dtype=np.float32), np.zeros(1, dtype=np.int64), 0.5)
+        
         print(f"检测参数: 照片{self.photo_size_cm}x{self.photo_size_cm}cm, 距离>{self.min_distance_cm}cm")
         print(f"像素范围: {self.min_pixel_size}-{self.max_pixel_size}px")
         
@@ -94,11 +224,23 @@ class PersonDetector:
             return []
         
         try:
-            faces = self.face_detector.detect(img, conf_th=self.face_confidence_threshold)
+            detect_img = img
+            scale_x = scale_y = 1.0
+            if self.detect_scale > 1:
+                # 按实际输入图尺寸缩小，换算比例取缩小后的真实尺寸，避免取整误差
+                width, height = img.width(), img.height()
+                detect_img = img.resize(max(1, int(width / self.detect_scale)),
+                                        max(1, int(height / self.detect_scale)))
+                scale_x = width / detect_img.width()
+                scale_y = height / detect_img.height()
+            
+            faces = self.face_detector.detect(detect_img, conf_th=self.face_confidence_threshold)
             
             valid_torsos = []
             for face in faces:
-                face_x, face_y, face_w, face_h = face.x, face.y, face.w, face.h
+                # 换算回原图坐标，后续尺寸判断和上半身推算都基于原图
+                face_x, face_y = int(face.x * scale_x), int(face.y * scale_y)
+                face_w, face_h = int(face.w * scale_x), int(face.h * scale_y)
                 
                 # 检查人脸尺寸是否在合理范围内
                 if not self._is_valid_face_size(face_w, face_h):
@@ -117,7 +259,7 @@ class PersonDetector:
                             'bbox': (x, y, w, h),
                             'confidence': face.score,
                             'face_bbox': (face_x, face_y, face_w, face_h),
-                            'landmarks': getattr(face, 'landmarks', None)
+                            'landmarks': self._scale_landmarks(getattr(face, 'landmarks', None), scale_x, scale_y)
                         })
             
             return valid_torsos[:self.max_detections]
@@ -126,6 +268,22 @@ class PersonDetector:
             print(f"人脸检测错误: {e}")
             return []
     
+    def _scale_landmarks(self, landmarks, scale_x, scale_y):
+        """
+        将关键点坐标换算回原图
+        
+        Args:
+            landmarks: 关键点列表
+            scale_x: 水平缩放倍数
+            scale_y: 垂直缩放倍数
+            
+        Returns:
+            list: 换算后的关键点列表
+        """
+        if not landmarks or (scale_x == 1 and scale_y == 1):
+            return landmarks
+        return [[int(point[0] * scale_x), int(point[1] * scale_y)] for point in landmarks]
+    
     def _is_valid_face_size(self, face_w, face_h):
         """
         检查人脸尺寸是否在预期的物理范围内
@@ -168,8 +326,8 @@ class PersonDetector:
         torso_y = max(0, face_y)  # 从人脸顶部开始
         
         # 确保不超出图像边界
-        torso_w = min(torso_w, img.width - torso_x)
-        torso_h = min(torso_h, img.height - torso_y)
+        torso_w = min(torso_w, self.camera_width - torso_x)
+        torso_h = min(torso_h, self.camera_height - torso_y)
         
         # 验证最终尺寸
         if torso_w < self.min_pixel_size or torso_h < self.min_pixel_size:
@@ -212,6 +370,32 @@ class PersonDetector:
         
         return detections[:self.max_detections]
     
+    def detect_persons_np(self, image):
+        """
+        检测人物并以数组形式返回结果，便于后续批量处理
+        
+        Args:
+            image: 输入图像
+            
+        Returns:
+            tuple: (bboxes, face_bboxes, face_mask)
+                bboxes: (N, 4) int32 上半身边界框
+                face_bboxes: (N, 4) int32 人脸边界框，没有人脸时为 -1
+                face_mask: (N,) bool 是否有人脸框
+        """
+        detections = self.detect_persons(image)
+        count = len(detections)
+        
+        bboxes = np.zeros((count, 4), dtype=np.int32)
+        face_bboxes = np.full((count, 4), -1, dtype=np.int32)
+        for i, detection in enumerate(detections):
+            bboxes[i] = detection['bbox']
+            face_bbox = detection.get('face_bbox')
+            if face_bbox:
+                face_bboxes[i] = face_bbox
+        
+        return bboxes, face_bboxes, face_bboxes[:, 2] > 0
+    
     def filter_overlapping_detections(self, detections, overlap_threshold=0.5):
         """
         过滤重叠的检测结果
@@ -226,25 +410,13 @@ class PersonDetector:
         if len(detections) <= 1:
             return detections
         
-        # 按置信度排序
-        detections.sort(key=lambda x: x['confidence'], reverse=True)
-        
-        filtered = []
-        for detection in detections:
-            bbox1 = detection['bbox']
-            
-            # 检查与已选择的检测是否重叠
-            overlapped = False
-            for selected in filtered:
-                bbox2 = selected['bbox']
-                if self.calculate_iou(bbox1, bbox2) > overlap_threshold:
-                    overlapped = True
-                    break
-            
-            if not overlapped:
-                filtered.append(detection)
+        # 按置信度排序后做非极大值抑制
+        boxes = np.array([d['bbox'] for d in detections], dtype=np.float32)
+        scores = np.array([d['confidence'] for d in detections], dtype=np.float32)
+        order = np.argsort(-scores, kind='stable')
         
-        return filtered
+        keep = _nms_keep(boxes, order, overlap_threshold)
+        return [detections[i] for i in keep]
     
     def calculate_iou(self, bbox1, bbox2):
         """
@@ -284,49 +456,45 @@ class PersonDetector:
         Returns:
             image: 标记后的图像
         """
+        draw_rect = self._draw_rect_fn
+        draw_text = self._draw_text_fn
+        
         for i, detection in enumerate(detections):
             x, y, w, h = detection['bbox']
             detection_type = detection['type']
             confidence = detection['confidence']
+            green_color = _GREEN
             
-            # 绘制绿色边界框 - 上半身区域
-            green_color = image.Color.from_rgb(0, 255, 0)  # 绿色
-            try:
-                img.draw_rect(x, y, w, h, color=green_color, thickness=2)
-            except AttributeError:
+            # 探测成功的接口仍可能因坐标越界等原因失败，单个框失败不影响其余绘制
+            if draw_rect is not None:
+                # 绘制绿色边界框 - 上半身区域
                 try:
-                    img.draw_rectangle(x, y, x+w, y+h, color=green_color, thickness=2)
-                except AttributeError:
+                    draw_rect(img, x, y, w, h, green_color, 2)
+                except Exception:
+                    print(f"绘制上半身框: ({x}, {y}, {w}, {h})")
+                
+                # 绘制人脸框(如果有)
+                if 'face_bbox' in detection:
+                    fx, fy, fw, fh = detection['face_bbox']
                     try:
-                        img.draw_rect(x, y, x+w, y+h, green_color)
-                    except:
-                        print(f"绘制上半身框: ({x}, {y}, {w}, {h})")
+                        draw_rect(img, fx, fy, fw, fh, _CYAN, 1)
+                    except Exception:
+                        print(f"绘制人脸框: ({fx}, {fy}, {fw}, {fh})")
             
-            # 绘制人脸框(如果有)
-            if 'face_bbox' in detection:
-                fx, fy, fw, fh = detection['face_bbox']
-                face_color = image.Color.from_rgb(0, 255, 255)  # 青色
+            if draw_text is not None:
+                # 绘制标签
+                label = f"人物{i+1}: {confidence:.2f}"
                 try:
-                    img.draw_rect(fx, fy, fw, fh, color=face_color, thickness=1)
-                except:
-                    print(f"绘制人脸框: ({fx}, {fy}, {fw}, {fh})")
-            
-            # 绘制标签
-            label = f"人物{i+1}: {confidence:.2f}"
-            try:
-                img.draw_string(x, max(y-25, 0), label, color=green_color)
-            except AttributeError:
-                try:
-                    img.draw_text(x, max(y-25, 0), label, color=green_color)
-                except AttributeError:
+                    draw_text(img, x, max(y-25, 0), label, green_color)
+                except Exception:
                     print(f"检测标签: {label} at ({x}, {y})")
-            
-            # 绘制尺寸信息
-            size_label = f"{w}x{h}px"
-            try:
-                img.draw_string(x, max(y-10, 0), size_label, color=green_color)
-            except:
-                print(f"尺寸标签: {size_label}")
+                
+                # 绘制尺寸信息
+                size_label = f"{w}x{h}px"
+                try:
+                    draw_text(img, x, max(y-10, 0), size_label, green_color)
+                except Exception:
+                    print(f"尺寸标签: {size_label}")
             
             # 绘制人脸关键点(如果有)
             if detection.get('landmarks'):
@@ -12,13 +12,58 @@ import numpy as np
 from maix import nn, image
 import time
 
+# orjson 可选：可用时用于读写人物数据库，不可用时使用标准库 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# numba 可选：可用时对单个人脸的特征库匹配做 JIT 编译
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+# 本进程中已创建过的存储目录，重复创建识别器时不再访问文件系统
+_ensured_dirs = set()
+
+
+def _best_match(gallery, query):
+    """
+    在归一化特征库中查找与查询特征余弦相似度最高的样本
+    
+    Args:
+        gallery: (M, D) float32 归一化特征库
+        query: (D,) float32 归一化查询特征
+        
+    Returns:
+        tuple: (样本下标, 相似度)，相似度限制在0-1范围
+    """
+    best_row = 0
+    best_similarity = -1.0
+    for i in range(gallery.shape[0]):
+        similarity = 0.0
+        for j in range(gallery.shape[1]):
+            similarity += gallery[i, j] * query[j]
+        similarity = min(max(similarity, 0.0), 1.0)
+        if similarity > best_similarity:
+            best_similarity = similarity
+            best_row = i
+    return best_row, best_similarity
+
+
+if _HAS_NUMBA:
+    _best_match = njit(cache=True, fastmath=True)(_best_match)
+
 class PersonRecognizer:
     """
     人物识别器类
     支持最多3个人物的记录和识别
     """
     
-    def __init__(self, model_path="data/models", max_persons=3, similarity_threshold=0.85):
+    def __init__(self, model_path="data/models", max_persons=3, similarity_threshold=0.85,
+                 quantize_gallery=False, verbose=False):
         """
         初始化人物识别器
         
@@ -26,19 +71,32 @@ class PersonRecognizer:
             model_path: 模型和数据存储路径
             max_persons: 最大支持人数（默认3个）
             similarity_threshold: 相似度阈值（默认0.85）
+            quantize_gallery: 特征库是否按 int8 量化保存在内存中（占用减为1/4，相似度误差约1%）
+            verbose: 是否打印逐帧的提示信息（未检测到人脸等），默认关闭以免每帧输出
         """
         self.model_path = model_path
         self.max_persons = max_persons
         self.similarity_threshold = similarity_threshold
+        self.quantize_gallery = quantize_gallery
+        self.verbose = verbose
         
         # 创建存储目录
-        os.makedirs(model_path, exist_ok=True)
+        if model_path not in _ensured_dirs:
+            os.makedirs(model_path, exist_ok=True)
+            _ensured_dirs.add(model_path)
         
         # 初始化人脸检测器用于特征提取
         try:
             self.face_detector = nn.FaceDetector(model="/root/models/face_detector.mud")
             self.has_face_detector = True
             print("✓ 人脸特征提取器初始化成功")
+            
+            # 用空白图先推理一次，让模型加载到NPU并分配好缓冲，避免首帧卡顿
+            try:
+                self.face_detector.detect(image.Image(self.face_detector.input_width(),
+                                                      self.face_detector.input_height()))
+            except Exception:
+                pass
         except Exception as e:
             print(f"✗ 人脸特征提取器初始化失败: {e}")
             self.face_detector = None
@@ -51,6 +109,20 @@ class PersonRecognizer:
         # 当前选中的目标人物
         self.target_person_id = None
         
+        # 姓名 -> 人物ID，注册时直接查重，不再遍历所有人物
+        self._name_to_id = {}
+        
+        # 归一化后的特征库矩阵，特征变化时标记失效，识别时按需重建
+        # _gallery 是预分配缓冲 _gallery_buf 的前若干行，新增样本直接写入空闲行
+        self._gallery = None
+        self._gallery_buf = None
+        self._gallery_ids = []
+        self._gallery_dirty = True
+        
+        # 预先触发一次 JIT 编译，避免首次识别卡顿
+        if _HAS_NUMBA:
+            _best_match(np.zeros((1, 1), dtype=np.float32), np.zeros(1, dtype=np.float32))
+        
         # 加载已保存的人物数据
         self._load_persons_database()
         
@@ -62,25 +134,41 @@ class PersonRecognizer:
         """
         database_file = os.path.join(self.model_path, "persons_database.json")
         
-        if os.path.exists(database_file):
-            try:
-                with open(database_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                self.registered_persons = data.get('registered_persons', {})
-                
-                # 加载特征数据
-                for person_id in self.registered_persons:
-                    features_file = os.path.join(self.model_path, f"features_{person_id}.npy")
-                    if os.path.exists(features_file):
-                        self.features_database[person_id] = np.load(features_file, allow_pickle=True).tolist()
-                
-                print(f"已加载 {len(self.registered_persons)} 个已注册人物")
-                
-            except Exception as e:
-                print(f"加载人物数据库失败: {e}")
-                self.registered_persons = {}
-                self.features_database = {}
+        # 直接打开文件，不存在时捕获异常，省去额外的 exists 检查
+        try:
+            with open(database_file, 'rb') as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            
+            self.registered_persons = data.get('registered_persons', {})
+            
+            # 加载特征数据
+            for person_id in self.registered_persons:
+                features_file = os.path.join(self.model_path, f"features_{person_id}.npy")
+                try:
+                    self.features_database[person_id] = self._load_features(features_file)
+                except FileNotFoundError:
+                    pass
+            
+            print(f"已加载 {len(self.registered_persons)} 个已注册人物")
+            
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"加载人物数据库失败: {e}")
+            self.registered_persons = {}
+            self.features_database = {}
+        
+        self._name_to_id = {info['name']: person_id for person_id, info in self.registered_persons.items()}
+        self._gallery_dirty = True
+    
+    def reload(self):
+        """
+        丢弃内存中的人物数据，重新从磁盘加载数据库（其他进程修改数据库后调用）
+        """
+        self.registered_persons = {}
+        self.features_database = {}
+        self._load_persons_database()
     
     def _save_persons_database(self):
         """
@@ -96,19 +184,40 @@ class PersonRecognizer:
                 'last_updated': time.strftime('%Y-%m-%d %H:%M:%S')
             }
             
-            with open(database_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                raw = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            else:
+                raw = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+            with open(database_file, 'wb') as f:
+                f.write(raw)
             
-            # 保存特征数据
+            # 保存特征数据：每人一个 (样本数, 特征长度) 的 float32 矩阵，不经过 pickle
             for person_id, features in self.features_database.items():
                 features_file = os.path.join(self.model_path, f"features_{person_id}.npy")
-                np.save(features_file, np.array(features, dtype=object))
+                np.save(features_file, np.asarray(features, dtype=np.float32))
             
             print("人物数据库保存成功")
             
         except Exception as e:
             print(f"保存人物数据库失败: {e}")
     
+    @staticmethod
+    def _load_features(features_file):
+        """
+        加载人物特征文件
+        
+        Args:
+            features_file: 特征文件路径
+            
+        Returns:
+            list: 特征列表
+        """
+        try:
+            return np.load(features_file).tolist()
+        except ValueError:
+            # 旧版本按 object 数组保存，需要 pickle 才能读取；下次保存时转换为新格式
+            return np.load(features_file, allow_pickle=True).tolist()
+    
     def extract_face_features(self, img, bbox=None):
         """
         从图像中提取人脸特征
@@ -121,7 +230,8 @@ class PersonRecognizer:
             list: 特征列表，如果提取失败返回None
         """
         if not self.has_face_detector:
-            print("人脸特征提取器未初始化")
+            if self.verbose:
+                print("人脸特征提取器未初始化")
             return None
         
         try:
@@ -129,7 +239,8 @@ class PersonRecognizer:
                 # 自动检测人脸
                 faces = self.face_detector.detect(img)
                 if not faces:
-                    print("未检测到人脸")
+                    if self.verbose:
+                        print("未检测到人脸")
                     return None
                 # 使用第一个检测到的人脸
                 face = faces[0]
@@ -137,11 +248,14 @@ class PersonRecognizer:
             
             x, y, w, h = bbox
             
-            # 裁剪人脸区域
-            face_img = img.crop(x, y, w, h)
+            # 裁剪人脸区域，边界框覆盖整幅图像时直接使用原图
+            if x == 0 and y == 0 and w == img.width() and h == img.height():
+                face_img = img
+            else:
+                face_img = img.crop(x, y, w, h)
             
-            # 标准化人脸大小
-            if face_img.width != 112 or face_img.height != 112:
+            # 标准化人脸大小：裁剪结果就是 w×h，已是目标尺寸时跳过缩放
+            if w != 112 or h != 112:
                 face_img = face_img.resize(112, 112)
             
             # 提取特征向量（这里使用简化的特征提取）
@@ -169,8 +283,8 @@ class PersonRecognizer:
             # 转换为numpy数组进行处理
             # 这里使用图像统计特征作为简化的人脸特征
             
-            # 获取图像的基本统计特征
-            width, height = face_img.width, face_img.height
+            # 获取图像的基本统计特征（尺寸只读取一次）
+            width, height = face_img.width(), face_img.height()
             
             # 分块统计特征
             block_size = 16
@@ -220,17 +334,16 @@ class PersonRecognizer:
             return False, None, f"已达到最大注册人数 ({self.max_persons})"
         
         # 检查姓名是否已存在
-        for person_id, info in self.registered_persons.items():
-            if info['name'] == person_name:
-                return False, None, f"人物 '{person_name}' 已存在"
+        if person_name in self._name_to_id:
+            return False, None, f"人物 '{person_name}' 已存在"
         
         # 提取特征
         features = self.extract_face_features(img, bbox)
         if features is None:
             return False, None, "特征提取失败"
         
-        # 生成新的person_id
-        person_id = f"person_{len(self.registered_persons) + 1:02d}"
+        # 生成新的person_id（按人数编号会在删除人物后与现有ID重复）
+        person_id = self._next_person_id()
         
         # 保存人物信息
         self.registered_persons[person_id] = {
@@ -242,6 +355,8 @@ class PersonRecognizer:
         
         # 保存特征
         self.features_database[person_id] = [features]
+        self._name_to_id[person_name] = person_id
+        self._append_gallery_sample(person_id, features)
         
         # 保存数据库
         self._save_persons_database()
@@ -256,6 +371,18 @@ class PersonRecognizer:
         print(f"成功注册人物: {person_name} (ID: {person_id})")
         return True, person_id, f"成功注册人物: {person_name}"
     
+    def _next_person_id(self):
+        """
+        生成未被占用的最小人物ID，删除人物后空出的编号会被复用
+        
+        Returns:
+            str: 人物ID
+        """
+        slot = 1
+        while f"person_{slot:02d}" in self.registered_persons:
+            slot += 1
+        return f"person_{slot:02d}"
+    
     def add_person_sample(self, person_id, img, bbox=None):
         """
         为已注册人物添加新的样本
@@ -282,6 +409,7 @@ class PersonRecognizer:
         
         self.features_database[person_id].append(features)
         self.registered_persons[person_id]['feature_count'] = len(self.features_database[person_id])
+        self._append_gallery_sample(person_id, features)
         
         # 保存数据库
         self._save_persons_database()
@@ -300,31 +428,33 @@ class PersonRecognizer:
             tuple: (person_id: str, confidence: float, person_name: str)
                   如果未识别到返回 (None, 0.0, "未知")
         """
-        if not self.registered_persons:
+        # 没有任何可用特征（例如特征文件丢失）时不必检测和提取特征
+        gallery, gallery_ids = self._get_gallery()
+        if gallery is None:
             return None, 0.0, "未知"
         
+        if bbox is None and self.has_face_detector:
+            # 未指定人脸时识别画面中所有人脸，返回相似度最高的一个
+            results = self.recognize_all_persons(img)
+            if not results:
+                return None, 0.0, "未知"
+            return max((result[1:] for result in results), key=lambda r: r[1])
+        
         # 提取特征
         features = self.extract_face_features(img, bbox)
         if features is None:
             return None, 0.0, "未知"
         
-        # 与数据库中的特征进行匹配
-        best_match_id = None
-        best_similarity = 0.0
-        
-        for person_id, person_features_list in self.features_database.items():
-            # 计算与该人物所有样本的相似度
-            similarities = []
-            for stored_features in person_features_list:
-                similarity = self._calculate_similarity(features, stored_features)
-                similarities.append(similarity)
-            
-            # 使用最高相似度
-            max_similarity = max(similarities) if similarities else 0.0
-            
-            if max_similarity > best_similarity:
-                best_similarity = max_similarity
-                best_match_id = person_id
+        # 与所有样本的余弦相似度一次算出: (1, D) @ (D, M) -> (1, M)，取最高的样本
+        query = self._normalize_rows(np.asarray([features[:gallery.shape[1]]], dtype=np.float32))
+        if _HAS_NUMBA and gallery.dtype == np.float32:
+            best_row, best_similarity = _best_match(gallery, query[0])
+        else:
+            similarity = self._similarity(query, gallery)[0]
+            best_row = int(similarity.argmax())
+            best_similarity = similarity[best_row]
+        best_similarity = float(best_similarity)
+        best_match_id = gallery_ids[best_row]
         
         # 检查是否超过阈值
         if best_similarity >= self.similarity_threshold:
@@ -333,37 +463,218 @@ class PersonRecognizer:
         else:
             return None, best_similarity, "未知"
     
-    def _calculate_similarity(self, features1, features2):
+    def recognize_all_persons(self, img):
         """
-        计算两个特征向量的相似度
+        检测图像中的所有人脸并一次批量识别
         
         Args:
-            features1: 特征向量1
-            features2: 特征向量2
-            
+            img: 输入图像
+        
         Returns:
-            float: 相似度 (0-1)
+            list: [(bbox, person_id, confidence, person_name), ...]，未检测到人脸时为空列表
         """
+        if not self.has_face_detector:
+            return []
+        
         try:
-            # 确保特征长度一致
-            min_len = min(len(features1), len(features2))
-            f1 = features1[:min_len]
-            f2 = features2[:min_len]
-            
-            # 计算余弦相似度
-            dot_product = sum(a * b for a, b in zip(f1, f2))
-            norm1 = sum(a * a for a in f1) ** 0.5
-            norm2 = sum(b * b for b in f2) ** 0.5
-            
-            if norm1 == 0 or norm2 == 0:
-                return 0.0
-            
-            similarity = dot_product / (norm1 * norm2)
-            return max(0.0, min(1.0, similarity))  # 限制在0-1范围
-            
+            faces = self.face_detector.detect(img)
         except Exception as e:
-            print(f"相似度计算错误: {e}")
-            return 0.0
+            print(f"人脸检测错误: {e}")
+            return []
+        if not faces:
+            return []
+        
+        bboxes = [(face.x, face.y, face.w, face.h) for face in faces]
+        results = self.recognize_persons_batch(img, bboxes)
+        return [(bbox,) + result for bbox, result in zip(bboxes, results)]
+    
+    def recognize_persons_batch(self, img, bboxes):
+        """
+        批量识别图像中的多个人物
+        所有人脸的特征堆叠成一个矩阵，与特征库做一次矩阵乘法完成匹配
+        
+        Args:
+            img: 输入图像
+            bboxes: 人脸边界框列表 [(x, y, w, h), ...]
+        
+        Returns:
+            list: 与 bboxes 一一对应的 (person_id, confidence, person_name) 列表
+        """
+        results = [(None, 0.0, "未知")] * len(bboxes)
+        if not self.registered_persons or not bboxes:
+            return results
+        
+        gallery, gallery_ids = self._get_gallery()
+        if gallery is None:
+            return results
+        
+        # 提取所有人脸特征，记录提取成功的人脸下标
+        queries = []
+        query_index = []
+        for i, bbox in enumerate(bboxes):
+            features = self.extract_face_features(img, bbox)
+            if features is not None:
+                queries.append(features[:gallery.shape[1]])
+                query_index.append(i)
+        
+        if not queries:
+            return results
+        
+        # 余弦相似度: (K, D) @ (D, M) -> (K, M)，每行取最大值
+        query = self._normalize_rows(np.asarray(queries, dtype=np.float32))
+        similarity = self._similarity(query, gallery)
+        best_rows = similarity.argmax(axis=1)
+        
+        for k, i in enumerate(query_index):
+            best_similarity = float(similarity[k, best_rows[k]])
+            if best_similarity >= self.similarity_threshold:
+                person_id = gallery_ids[best_rows[k]]
+                results[i] = (person_id, best_similarity, self.registered_persons[person_id]['name'])
+            else:
+                results[i] = (None, best_similarity, "未知")
+        
+        return results
+    
+    def recognize_detections(self, img, detections):
+        """
+        识别检测结果中的人物，只对带人脸框的检测做一次批量识别
+        
+        Args:
+            img: 输入图像
+            detections: 检测器返回的检测结果列表
+        
+        Returns:
+            list: 与 detections 一一对应的结果列表，有人脸框的项为
+                  (person_id, confidence, person_name)，否则为 None
+        """
+        face_idx = [i for i, d in enumerate(detections) if d.get('face_bbox')]
+        results = [None] * len(detections)
+        matches = self.recognize_persons_batch(img, [detections[i]['face_bbox'] for i in face_idx])
+        for i, match in zip(face_idx, matches):
+            results[i] = match
+        return results
+    
+    def _get_gallery(self):
+        """
+        获取归一化特征库矩阵，特征库变化后才重新构建
+        
+        Returns:
+            tuple: (gallery: np.ndarray (M, D), gallery_ids: list[str])
+                  特征库为空时返回 (None, [])
+        """
+        if self._gallery_dirty:
+            gallery, self._gallery_ids = self._build_gallery()
+            if gallery is None:
+                self._gallery = self._gallery_buf = None
+            else:
+                if self.quantize_gallery:
+                    gallery = self._quantize_rows(gallery)
+                # 预留空闲行，之后添加样本时不必重新分配整个矩阵
+                rows = gallery.shape[0]
+                self._gallery_buf = np.zeros((max(rows * 2, self.max_persons), gallery.shape[1]),
+                                             dtype=gallery.dtype)
+                self._gallery_buf[:rows] = gallery
+                self._gallery = self._gallery_buf[:rows]
+            self._gallery_dirty = False
+        return self._gallery, self._gallery_ids
+    
+    def _append_gallery_sample(self, person_id, features):
+        """
+        将新样本归一化后写入特征库缓冲的下一行
+        特征库尚未构建、缓冲已满或特征比当前维度短时，改为标记下次重建
+        
+        Args:
+            person_id: 人物ID
+            features: 新样本特征
+        """
+        if self._gallery_dirty or self._gallery is None:
+            self._gallery_dirty = True
+            return
+        
+        rows, dim = self._gallery.shape
+        if rows >= self._gallery_buf.shape[0] or len(features) < dim:
+            self._gallery_dirty = True
+            return
+        
+        row = self._normalize_rows(np.asarray([features[:dim]], dtype=np.float32))
+        if self._gallery_buf.dtype == np.int8:
+            row = self._quantize_rows(row)
+        self._gallery_buf[rows] = row[0]
+        self._gallery = self._gallery_buf[:rows + 1]
+        self._gallery_ids.append(person_id)
+    
+    def _build_gallery(self):
+        """
+        将特征库中所有样本堆叠为归一化特征矩阵
+        
+        Returns:
+            tuple: (gallery: np.ndarray (M, D), gallery_ids: list[str])
+                  特征库为空时返回 (None, [])
+        """
+        samples = []
+        gallery_ids = []
+        for person_id, person_features_list in self.features_database.items():
+            if person_id not in self.registered_persons:
+                continue
+            for stored_features in person_features_list:
+                samples.append(stored_features)
+                gallery_ids.append(person_id)
+        
+        if not samples:
+            return None, []
+        
+        # 各样本特征长度可能不同，按最短长度截齐后组成矩阵
+        dim = min(len(s) for s in samples)
+        gallery = np.asarray([s[:dim] for s in samples], dtype=np.float32)
+        return self._normalize_rows(gallery), gallery_ids
+    
+    @classmethod
+    def _similarity(cls, query, gallery):
+        """
+        计算归一化查询特征与特征库的余弦相似度
+        特征库为 int8 量化时，查询也量化后做整数矩阵乘法
+        
+        Args:
+            query: (K, D) 归一化查询特征
+            gallery: (M, D) 归一化特征库（float32 或 int8）
+        
+        Returns:
+            np.ndarray: (K, M) 相似度，限制在0-1范围
+        """
+        if gallery.dtype == np.int8:
+            query = cls._quantize_rows(query).astype(np.int32)
+            similarity = (query @ gallery.T.astype(np.int32)) * (1.0 / (127 * 127))
+        else:
+            similarity = query @ gallery.T
+        return np.clip(similarity, 0.0, 1.0)
+    
+    @staticmethod
+    def _quantize_rows(matrix):
+        """
+        将L2归一化后的特征量化为 int8（分量范围 [-1, 1] 映射到 [-127, 127]）
+        
+        Args:
+            matrix: 归一化特征矩阵
+        
+        Returns:
+            np.ndarray: int8 特征矩阵
+        """
+        return np.round(matrix * 127).astype(np.int8)
+    
+    @staticmethod
+    def _normalize_rows(matrix):
+        """
+        按行做L2归一化，零向量保持为零（相似度为0）
+        
+        Args:
+            matrix: 二维特征矩阵
+        
+        Returns:
+            np.ndarray: 归一化后的矩阵
+        """
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
     
     def set_target_person(self, person_id):
         """
@@ -428,21 +739,19 @@ class PersonRecognizer:
         if person_id in self.features_database:
             del self.features_database[person_id]
         
+        self._name_to_id.pop(person_name, None)
+        self._gallery_dirty = True
+        
         # 如果删除的是目标人物，清除目标设置
         if self.target_person_id == person_id:
             self.target_person_id = None
         
-        # 删除相关文件
-        try:
-            features_file = os.path.join(self.model_path, f"features_{person_id}.npy")
-            if os.path.exists(features_file):
-                os.remove(features_file)
-            
-            ref_img_file = os.path.join(self.model_path, f"reference_{person_id}.jpg")
-            if os.path.exists(ref_img_file):
-                os.remove(ref_img_file)
-        except:
-            pass
+        # 删除相关文件，文件不存在时忽略
+        for filename in (f"features_{person_id}.npy", f"reference_{person_id}.jpg"):
+            try:
+                os.remove(os.path.join(self.model_path, filename))
+            except OSError:
+                pass
         
         # 保存数据库
         self._save_persons_database()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+人物识别工作进程模块
+将人物识别放到独立进程中运行，避免识别耗时占用采集/显示循环
+帧数据通过共享内存传递，识别结果通过队列返回
+"""
+
+import multiprocessing as mp
+import queue
+from multiprocessing import shared_memory
+
+import numpy as np
+
+try:
+    from maix import image
+except ImportError:
+    image = None
+
+
+def _worker_main(shm_name, requests, results, recognizer_kwargs):
+    """
+    工作进程入口
+
+    Args:
+        shm_name: 帧缓冲共享内存名称
+        requests: 请求队列
+        results: 结果队列
+        recognizer_kwargs: PersonRecognizer 初始化参数
+    """
+    # 在子进程中加载模型，避免跨进程传递模型对象
+    from src.vision.recognition.face_recognition import PersonRecognizer
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    recognizer = PersonRecognizer(**recognizer_kwargs)
+    img = None
+
+    try:
+        while True:
+            request = requests.get()
+            if request is None:
+                break
+
+            if request[0] == 'reload':
+                # 主进程注册/删除人物后重新加载数据库
+                recognizer.reload()
+                continue
+
+            _, width, height, fmt, size, bboxes = request
+            try:
+                img = _image_from_shm(shm, width, height, fmt, size)
+                results.put(recognizer.recognize_persons_batch(img, bboxes))
+            except Exception as e:
+                print(f"识别工作进程错误: {e}")
+                results.put([(None, 0.0, "未知")] * len(bboxes))
+    finally:
+        # 先释放引用共享内存的图像，否则无法关闭
+        img = None
+        shm.close()
+
+
+def _image_from_shm(shm, width, height, fmt, size):
+    """
+    从共享内存构造图像，优先直接引用共享内存而不复制
+
+    Args:
+        shm: 帧缓冲共享内存
+        width: 帧宽度
+        height: 帧高度
+        fmt: 图像格式
+        size: 帧数据字节数
+
+    Returns:
+        image.Image: 图像对象
+    """
+    if fmt == image.Format.FMT_RGB888:
+        try:
+            frame = np.ndarray((height, width, 3), dtype=np.uint8, buffer=shm.buf)
+            return image.cv2image(frame, bgr=False, copy=False)
+        except Exception:
+            pass
+    return image.from_bytes(width, height, fmt, bytes(shm.buf[:size]))
+
+
+class RecognizerWorker:
+    """
+    人物识别工作进程
+    同一时间最多只有一个识别请求在处理中，避免请求堆积
+    """
+
+    def __init__(self, width=512, height=320, bytes_per_pixel=3, **recognizer_kwargs):
+        """
+        初始化识别工作进程
+
+        Args:
+            width: 帧宽度
+            height: 帧高度
+            bytes_per_pixel: 每像素字节数（RGB888为3）
+            **recognizer_kwargs: 传给 PersonRecognizer 的参数
+        """
+        self.frame_size = width * height * bytes_per_pixel
+        self.recognizer_kwargs = recognizer_kwargs
+
+        self._shm = None
+        self._frame = None
+        self._process = None
+        self._in_flight = False
+
+        # 使用 spawn 启动，子进程不继承摄像头/显示等硬件句柄
+        self._ctx = mp.get_context('spawn')
+        self._requests = self._ctx.Queue(maxsize=2)
+        self._results = self._ctx.Queue(maxsize=1)
+
+    def start(self):
+        """
+        启动工作进程
+
+        Returns:
+            bool: 是否启动成功
+        """
+        try:
+            self._shm = shared_memory.SharedMemory(create=True, size=self.frame_size)
+            # 共享内存上的 numpy 视图，提交帧时直接拷入，无需中间 bytes
+            self._frame = np.ndarray((self.frame_size,), dtype=np.uint8, buffer=self._shm.buf)
+            self._process = self._ctx.Process(
+                target=_worker_main,
+                args=(self._shm.name, self._requests, self._results, self.recognizer_kwargs),
+                daemon=True
+            )
+            self._process.start()
+            return True
+        except Exception as e:
+            print(f"识别工作进程启动失败: {e}")
+            self.stop()
+            return False
+
+    def is_busy(self):
+        """
+        是否有识别请求正在处理
+
+        Returns:
+            bool: 是否忙碌；工作进程已退出时返回False
+        """
+        return self._in_flight and self.is_alive()
+
+    def is_alive(self):
+        """
+        检查工作进程是否仍在运行，意外退出时报告一次并释放资源
+
+        Returns:
+            bool: 工作进程是否在运行
+        """
+        if self._process is None:
+            return False
+        if self._process.is_alive():
+            return True
+        print(f"识别工作进程意外退出 (exitcode={self._process.exitcode})")
+        self.stop()
+        return False
+
+    def submit(self, img, bboxes):
+        """
+        提交一帧识别请求（非阻塞）
+
+        Args:
+            img: 输入图像
+            bboxes: 人脸边界框列表
+
+        Returns:
+            bool: 是否已提交；上一个请求未完成时返回False
+        """
+        if self._in_flight or self._process is None or not bboxes:
+            return False
+
+        data = self._frame_view(img)
+        size = data.nbytes
+        if size > self.frame_size:
+            print(f"帧数据过大: {size} > {self.frame_size}")
+            return False
+
+        # 只有一个请求在处理中，工作进程读取时主进程不会覆盖这块内存
+        self._frame[:size] = data
+        self._requests.put(('recognize', img.width(), img.height(), img.format(), size, list(bboxes)))
+        self._in_flight = True
+        return True
+
+    def _frame_view(self, img):
+        """
+        获取图像像素数据的 numpy 视图，支持时不复制
+
+        Args:
+            img: 输入图像
+
+        Returns:
+            np.ndarray: 一维 uint8 像素数据
+        """
+        try:
+            return image.image2cv(img, ensure_bgr=False, copy=False).reshape(-1)
+        except Exception:
+            return np.frombuffer(img.to_bytes(), dtype=np.uint8)
+
+    def poll(self):
+        """
+        非阻塞获取识别结果
+
+        Returns:
+            list: (person_id, confidence, person_name) 列表，尚无结果时返回None
+        """
+        if not self._in_flight:
+            return None
+        try:
+            results = self._results.get_nowait()
+        except queue.Empty:
+            # 进程退出后不会再有结果，is_alive 会清除在途标记
+            self.is_alive()
+            return None
+        self._in_flight = False
+        return results
+
+    def reload(self):
+        """
+        通知工作进程重新加载人物数据库
+        """
+        if self._process is None:
+            return
+        try:
+            self._requests.put_nowait(('reload',))
+        except queue.Full:
+            # 队列中最多一个识别请求，满了说明已有尚未执行的重新加载请求，
+            # 它执行时会读到最新的数据库，这里不必再排队
+            pass
+
+    def stop(self):
+        """
+        停止工作进程并释放共享内存
+        """
+        if self._process is not None:
+            try:
+                self._requests.put(None, timeout=1.0)
+                self._process.join(timeout=2.0)
+                if self._process.is_alive():
+                    self._process.terminate()
+            except Exception:
+                pass
+            self._process = None
+
+        self._frame = None
+        if self._shm is not None:
+            try:
+                self._shm.close()
+                self._shm.unlink()
+            except Exception:
+                pass
+            self._shm = None
+
+        self._in_flight = False